@@ -19,6 +19,9 @@ DOWN = 'down'
 LEFT = 'left'
 RIGHT = 'right'
 
+# moving the blank back undoes a move
+OPPOSITE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
 # heuristics
 ZERO = 'zero'
 MISPLACED = 'misplaced'
@@ -64,9 +67,23 @@ class EightPuzzleProblem:
         tiles[i], tiles[j] = tiles[j], tiles[i]
         return EightPuzzleState(tuple(tiles))
 
+    def Predecessors(self, s: EightPuzzleState) -> List[Tuple[EightPuzzleState, str, float]]:
+        """
+        (s_prev, a, cost) for every s_prev with Transition(s_prev, a) == s.
+        """
+        preds: List[Tuple[EightPuzzleState, str, float]] = []
+        for back in self.Actions(s):
+            s_prev = self.Transition(s, back)
+            a = OPPOSITE[back]
+            preds.append((s_prev, a, self.Cost(s_prev, a, s)))
+        return preds
+
     def GoalTest(self, s: EightPuzzleState) -> bool:
         return s.tiles == self.goal
 
+    def GoalStates(self) -> List[EightPuzzleState]:
+        return [EightPuzzleState(self.goal)]
+
     def Cost(self, s1: EightPuzzleState, a: str, s2: EightPuzzleState) -> float:
         return 1.0
 
@@ -11,12 +11,18 @@ We connect this to the generic solver in csp.py:
 - consistent_fn(var, value, assignment): Sudoku row/col/block check
 - legal_values_fn(var, assignment): values not used by assigned peers
 
-Run this file to solve the puzzle defined in PUZZLE below.
+solve_sudoku_dlx / count_solutions_sudoku_dlx solve the same puzzles as an
+exact-cover problem with Dancing Links (see search/dlx.py), which is much
+faster for bulk work.
+
+Run this file (python -m simple_search.problems.sudoku) to solve the puzzle
+defined in PUZZLE below.
 Use 0 or '.' for empty cells.
 """
 
-from typing import Dict, List, Set, Tuple
-from csp import backtracking_search, DomainMap, Assignment
+from typing import Any, Dict, List, Optional, Set, Tuple
+from simple_search.search.csp import backtracking_search, DomainMap, Assignment
+from simple_search.search.dlx import DLXStats, ExactCover
 
 
 # ---------- 1) Define the Sudoku variables (X) ----------
@@ -82,6 +88,9 @@ def build_peers() -> Dict[str, Set[str]]:
 
 PEERS = build_peers()
 VARIABLES = all_variables()
+# PEERS as sorted lists, for the solver's constraint graph: set order depends
+# on the string hash seed, and incremental MRV breaks ties in neighbor order.
+NEIGHBORS: Dict[str, List[str]] = {v: sorted(PEERS[v]) for v in VARIABLES}
 
 
 # ---------- 3) Parse a puzzle and create domains (D) ----------
@@ -135,6 +144,13 @@ def is_consistent_sudoku(var: str, value: int, assignment: Assignment) -> bool:
     return True
 
 
+def conflicts_sudoku(var: str, value: int, assignment: Assignment) -> List[str]:
+    """
+    The assigned peers that stop `var` from taking `value` (for backjumping).
+    """
+    return [peer for peer in PEERS[var] if assignment.get(peer) == value]
+
+
 def legal_values_sudoku(var: str, assignment: Assignment, domains: DomainMap) -> List[int]:
     """
     LEGAL_VALUES(X_i | A, C):
@@ -147,7 +163,26 @@ def legal_values_sudoku(var: str, assignment: Assignment, domains: DomainMap) ->
     return legal
 
 
-# ---------- 5) Pretty-print helpers ----------
+def sudoku_csp(puzzle_rows: List[str]) -> Dict[str, Any]:
+    """
+    Keyword arguments for backtracking_search(**sudoku_csp(rows)).
+    """
+    domains, _ = parse_puzzle_to_domains(puzzle_rows)
+
+    def legal_values_fn(var: str, A: Assignment) -> List[int]:
+        return legal_values_sudoku(var, A, domains)
+
+    return {
+        "variables": VARIABLES,
+        "domains": domains,
+        "consistent_fn": is_consistent_sudoku,
+        "legal_values_fn": legal_values_fn,
+        "neighbors": NEIGHBORS,
+        "conflicts_fn": conflicts_sudoku,
+    }
+
+
+# ---------- 5) Pretty-print and line-format helpers ----------
 def print_grid(assignment: Assignment) -> None:
     """
     Print the Sudoku grid from an assignment (assumes complete).
@@ -166,7 +201,91 @@ def print_grid(assignment: Assignment) -> None:
         print(" ".join(row_vals))
 
 
-# ---------- 6) Example puzzle and solve ----------
+def split_puzzle_line(line: str) -> List[str]:
+    """
+    One puzzle per line (81 characters, row by row) -> the 9 row strings
+    parse_puzzle_to_domains expects.
+    """
+    line = line.strip()
+    if len(line) != 81:
+        raise ValueError("Puzzle line must have 81 characters")
+    return [line[9 * r:9 * r + 9] for r in range(9)]
+
+
+def format_solution_line(assignment: Assignment) -> str:
+    """
+    Assignment -> 81-character line (0 for any unassigned cell).
+    """
+    return "".join(str(assignment.get(f"r{r}c{c}", 0)) for r in range(1, 10) for c in range(1, 10))
+
+
+# ---------- 6) Exact cover (Dancing Links) ----------
+# Sudoku as exact cover: 729 candidate rows (r, c, digit), 324 columns.
+#   columns   0..80 : cell (r, c) is filled
+#   columns  81..161: row r contains digit d
+#   columns 162..242: col c contains digit d
+#   columns 243..323: block b contains digit d
+def _cover_columns(r: int, c: int, d: int) -> Tuple[int, int, int, int]:
+    # r, c are 0-based; d is 1..9
+    b = (r // 3) * 3 + c // 3
+    return (9 * r + c, 81 + 9 * r + d - 1, 162 + 9 * c + d - 1, 243 + 9 * b + d - 1)
+
+
+_EMPTY_COVER: Optional[ExactCover] = None
+
+
+def build_exact_cover(puzzle_rows: List[str]) -> Optional[ExactCover]:
+    """
+    Build the exact-cover matrix for a puzzle with the givens already selected.
+    Returns None if the givens clash with each other.
+    """
+    global _EMPTY_COVER
+    domains, given_assignment = parse_puzzle_to_domains(puzzle_rows)
+    if _EMPTY_COVER is None:
+        # row id = 81 * r + 9 * c + (d - 1); built once and copied per puzzle
+        _EMPTY_COVER = ExactCover(324, [_cover_columns(rc // 81, (rc // 9) % 9, rc % 9 + 1) for rc in range(729)])
+    ec = _EMPTY_COVER.copy()
+    for var, d in given_assignment.items():
+        r, c = int(var[1]) - 1, int(var[3]) - 1
+        if not ec.select_row(81 * r + 9 * c + d - 1):
+            return None
+    return ec
+
+
+def _rows_to_assignment(row_ids: List[int]) -> Assignment:
+    assignment: Assignment = {}
+    for row_id in row_ids:
+        r, rest = divmod(row_id, 81)
+        c, d = divmod(rest, 9)
+        assignment[f"r{r + 1}c{c + 1}"] = d + 1
+    return assignment
+
+
+def solve_sudoku_dlx(puzzle_rows: List[str], stats: Optional[DLXStats] = None) -> Optional[Assignment]:
+    """
+    Solve with Algorithm X / Dancing Links. Same input rows as
+    parse_puzzle_to_domains, same Assignment format as backtracking_search.
+    """
+    ec = build_exact_cover(puzzle_rows)
+    if ec is None:
+        return None
+    solutions = ec.solve(limit=1, stats=stats)
+    if not solutions:
+        return None
+    return _rows_to_assignment(solutions[0])
+
+
+def count_solutions_sudoku_dlx(puzzle_rows: List[str], limit: int = 2, stats: Optional[DLXStats] = None) -> int:
+    """
+    Count solutions up to `limit` (limit=2 is the usual uniqueness check).
+    """
+    ec = build_exact_cover(puzzle_rows)
+    if ec is None:
+        return 0
+    return ec.count_solutions(limit=limit, stats=stats)
+
+
+# ---------- 7) Example puzzle and solve ----------
 if __name__ == "__main__":
     # 0 or '.' means empty. This one is moderately easy.
     PUZZLE = [
@@ -207,6 +326,7 @@ if __name__ == "__main__":
         domains=domains,
         consistent_fn=consistent_fn,
         legal_values_fn=legal_values_fn,
+        neighbors=NEIGHBORS,  # constraint graph -> incremental MRV
     )
 
     if solution is None:
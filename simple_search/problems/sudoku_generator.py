@@ -0,0 +1,190 @@
+"""
+sudoku_generator.py
+Generate 9×9 Sudokus with a unique solution, and score how hard they are.
+
+Pipeline for one puzzle:
+1) random full grid: Dancing Links on the empty grid, trying candidate rows
+   in random order (ExactCover.solve with an rng)
+2) clue removal: visit the cells in random order, blank each one, and put it
+   back if the puzzle no longer has exactly one solution. The check is
+   count_solutions_sudoku_dlx(limit=2), which stops at the second solution.
+3) difficulty: effort to solve the final puzzle (see rate_puzzle)
+
+Every puzzle is built from its own Random(f"{seed}:{index}"), so a run is
+reproducible no matter how the work is split across processes.
+Puzzles are 81-character lines ('0' = empty), the format sudoku_batch reads.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import random
+from typing import List, Optional, Tuple
+
+from simple_search.problems.sudoku import (
+    build_exact_cover,
+    count_solutions_sudoku_dlx,
+    split_puzzle_line,
+)
+from simple_search.search.dlx import DLXStats
+
+ALL_DIGITS = 0x1FF  # bit d - 1 set = digit d still possible
+
+
+def _build_units() -> Tuple[List[List[int]], List[List[int]]]:
+    units: List[List[int]] = []
+    for r in range(9):
+        units.append([9 * r + c for c in range(9)])
+    for c in range(9):
+        units.append([9 * r + c for r in range(9)])
+    for br in range(0, 9, 3):
+        for bc in range(0, 9, 3):
+            units.append([9 * r + c for r in range(br, br + 3) for c in range(bc, bc + 3)])
+    peers: List[List[int]] = []
+    for cell in range(81):
+        ps = set()
+        for unit in units:
+            if cell in unit:
+                ps.update(unit)
+        ps.discard(cell)
+        peers.append(sorted(ps))
+    return units, peers
+
+
+# cell ids are 0..80, row-major
+UNITS, CELL_PEERS = _build_units()
+
+
+@dataclass
+class DifficultyScore:
+    clues: int = 0
+    search_nodes: int = 0    # DLX nodes to prove uniqueness (count to 2)
+    singles_rounds: int = 0  # propagation passes of naked + hidden singles
+    singles_left: int = 0    # empty cells singles alone could not fill
+    score: int = 0           # search_nodes + singles_rounds + 10 * singles_left
+
+
+def random_full_grid(rng: random.Random) -> str:
+    """
+    Search the empty grid with shuffled row order: a random solved grid (81 digits).
+    """
+    ec = build_exact_cover(["0" * 9] * 9)
+    row_ids = ec.solve(limit=1, rng=rng)[0]
+    grid = [0] * 81
+    for row_id in row_ids:
+        grid[row_id // 9] = row_id % 9 + 1
+    return "".join(map(str, grid))
+
+
+def has_unique_solution(line: str, stats: Optional[DLXStats] = None) -> bool:
+    return count_solutions_sudoku_dlx(split_puzzle_line(line), limit=2, stats=stats) == 1
+
+
+def propagate_singles(line: str) -> Tuple[int, int]:
+    """
+    Fill cells by naked singles (one candidate left) and hidden singles (a
+    digit with one place left in a unit) until neither applies.
+    Returns (passes made, empty cells left).
+    """
+    values = [0 if ch in "0." else int(ch) for ch in line]
+    cand = [ALL_DIGITS] * 81
+    for cell, v in enumerate(values):
+        if v:
+            bit = 1 << (v - 1)
+            for p in CELL_PEERS[cell]:
+                cand[p] &= ~bit
+
+    def place(cell: int, v: int) -> None:
+        values[cell] = v
+        bit = 1 << (v - 1)
+        for p in CELL_PEERS[cell]:
+            cand[p] &= ~bit
+
+    rounds = 0
+    progress = True
+    while progress:
+        progress = False
+        rounds += 1
+        for cell in range(81):
+            if values[cell] == 0:
+                m = cand[cell]
+                if m and m & (m - 1) == 0:
+                    place(cell, m.bit_length())
+                    progress = True
+        for unit in UNITS:
+            for d in range(9):
+                bit = 1 << d
+                spots = [cell for cell in unit if values[cell] == 0 and cand[cell] & bit]
+                if len(spots) == 1:
+                    place(spots[0], d + 1)
+                    progress = True
+    return rounds, values.count(0)
+
+
+def rate_puzzle(line: str) -> DifficultyScore:
+    """
+    Score a puzzle by search and propagation effort; higher is harder.
+    Puzzles that singles solve outright score low; every cell they leave
+    open adds 10, plus the DLX nodes needed to count up to 2 solutions.
+    """
+    stats = DLXStats()
+    count_solutions_sudoku_dlx(split_puzzle_line(line), limit=2, stats=stats)
+    rounds, left = propagate_singles(line)
+    clues = sum(1 for ch in line if ch not in "0.")
+    return DifficultyScore(clues, stats.nodes, rounds, left, stats.nodes + rounds + 10 * left)
+
+
+def generate_puzzle(
+    rng: random.Random,
+    min_clues: int = 17,
+    symmetric: bool = False,
+) -> str:
+    """
+    Random full grid, then remove clues while the solution stays unique.
+    Stops early once only `min_clues` clues remain. symmetric=True removes
+    cells in 180°-rotation pairs, as published puzzles usually do.
+    """
+    grid = list(random_full_grid(rng))
+    cells = list(range(81))
+    rng.shuffle(cells)
+    clues = 81
+    seen = set()
+    for cell in cells:
+        if cell in seen:
+            continue
+        group = {cell, 80 - cell} if symmetric else {cell}
+        seen.update(group)
+        if clues - len(group) < min_clues:
+            continue
+        saved = [(c, grid[c]) for c in group]
+        for c in group:
+            grid[c] = "0"
+        if has_unique_solution("".join(grid)):
+            clues -= len(group)
+        else:
+            for c, v in saved:
+                grid[c] = v
+    return "".join(grid)
+
+
+def puzzle_rng(seed: int, index: int) -> random.Random:
+    """
+    Independent, reproducible stream for puzzle `index` of a run.
+    """
+    return random.Random(f"{seed}:{index}")
+
+
+def generate_range(
+    span: Tuple[int, int],
+    seed: int = 0,
+    min_clues: int = 17,
+    symmetric: bool = False,
+) -> List[Tuple[str, DifficultyScore]]:
+    """
+    Worker entry point: puzzles start..end-1 of a run, with their scores.
+    """
+    start, end = span
+    out: List[Tuple[str, DifficultyScore]] = []
+    for i in range(start, end):
+        line = generate_puzzle(puzzle_rng(seed, i), min_clues, symmetric)
+        out.append((line, rate_puzzle(line)))
+    return out
@@ -0,0 +1,197 @@
+"""
+sudoku_nxn.py
+N²×N² Sudoku (9×9, 16×16 or 25×25) as a CSP ⟨X, D, C⟩ with integer variables.
+
+- Variables X: one int per cell, id = row * size + col (0-based, row-major)
+- Domains D: 1..size for empties; fixed singleton for givens
+- Constraints C: all-different on each row, each column, each box×box block
+
+sudoku.py keeps the readable "r{row}c{col}" 9×9 model. This one is for larger
+grids, where string keys and peer sets get expensive: the peer table is one
+flat array (cell c's peers are PEERS[c * peer_count:(c + 1) * peer_count]),
+built on first use and cached per box size.
+
+It plugs into the generic solver in csp.py, including incremental MRV:
+
+    model = SudokuModel(4)
+    solution = backtracking_search(**model.csp(puzzle_rows))
+
+Box sizes 2..MAX_BOX only: backtracking_search recurses once per cell, so a
+36×36 grid (1296 cells) would exceed Python's default recursion limit.
+
+Puzzles are rows of symbols: 1-9 then A-Z for values above 9 (so 16×16 uses
+1-9A-G), '0' or '.' for empty. Rows of whitespace-separated numbers also work.
+"""
+
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+from simple_search.search.csp import Assignment, DomainMap
+
+SYMBOLS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+EMPTY = "0."
+MAX_BOX = 5  # 25×25 = 625 cells, within the solver's recursion depth
+
+
+@dataclass(frozen=True)
+class SudokuTables:
+    box: int               # block side (3 for 9×9)
+    size: int              # box * box: side of the grid, number of values
+    n_cells: int           # size * size
+    peer_count: int        # peers per cell: 2 * (size - 1) + (box - 1) ** 2
+    peers: array           # flat, n_cells * peer_count cell ids
+    neighbors: List[memoryview]  # per-cell zero-copy views into `peers`
+
+
+@lru_cache(maxsize=None)
+def sudoku_tables(box: int) -> SudokuTables:
+    """
+    Build (once per box size) the flat peer table.
+    """
+    if box < 2 or box > MAX_BOX:
+        raise ValueError(f"Box size must be 2..{MAX_BOX} (4×4 to {MAX_BOX ** 2}×{MAX_BOX ** 2})")
+    size = box * box
+    n_cells = size * size
+    peer_count = 2 * (size - 1) + (box - 1) ** 2
+    peers = array("i")
+    for cell in range(n_cells):
+        r, c = divmod(cell, size)
+        br, bc = (r // box) * box, (c // box) * box
+        row_peers = [r * size + cc for cc in range(size) if cc != c]
+        col_peers = [rr * size + c for rr in range(size) if rr != r]
+        # block cells not already counted in the row or column
+        block_peers = [
+            rr * size + cc
+            for rr in range(br, br + box)
+            for cc in range(bc, bc + box)
+            if rr != r and cc != c
+        ]
+        peers.extend(row_peers + col_peers + block_peers)
+    view = memoryview(peers)
+    neighbors = [view[i * peer_count:(i + 1) * peer_count] for i in range(n_cells)]
+    return SudokuTables(box, size, n_cells, peer_count, peers, neighbors)
+
+
+class SudokuModel:
+    def __init__(self, box: int = 3):
+        self.tables = sudoku_tables(box)
+        self.box = box
+        self.size = self.tables.size
+        self.variables: List[int] = list(range(self.tables.n_cells))
+
+    # ---------- parse / format ----------
+    def _row_values(self, row: str) -> List[int]:
+        if any(ch.isspace() or ch == "," for ch in row.strip()):
+            return [int(tok) for tok in row.replace(",", " ").split()]
+        values: List[int] = []
+        for ch in row:
+            if ch in EMPTY:
+                values.append(0)
+            else:
+                v = SYMBOLS.find(ch.upper()) + 1
+                if v == 0:
+                    raise ValueError(f"Unknown symbol: {ch!r}")
+                values.append(v)
+        return values
+
+    def parse(self, puzzle_rows: Sequence[str]) -> Tuple[DomainMap, Assignment]:
+        """
+        puzzle_rows: `size` rows of `size` cells each.
+
+        Returns:
+          - domains: list of allowed values for each cell id.
+          - assignment: pre-filled values from the puzzle (givens).
+        """
+        size = self.size
+        if len(puzzle_rows) != size:
+            raise ValueError(f"Puzzle must have {size} rows")
+        domains: DomainMap = {}
+        assignment: Assignment = {}
+        allowed = list(range(1, size + 1))
+        for r, row in enumerate(puzzle_rows):
+            values = self._row_values(row)
+            if len(values) != size:
+                raise ValueError(f"Each puzzle row must have {size} cells")
+            for c, v in enumerate(values):
+                var = r * size + c
+                if v == 0:
+                    domains[var] = list(allowed)
+                elif 1 <= v <= size:
+                    domains[var] = [v]
+                    assignment[var] = v
+                else:
+                    raise ValueError(f"Values must be 1..{size} or '.'/0 for empty")
+        return domains, assignment
+
+    def format_line(self, assignment: Assignment) -> str:
+        """
+        Assignment -> one line of symbols ('.' for any unassigned cell).
+        """
+        if self.size > len(SYMBOLS):
+            return " ".join(str(assignment.get(v, 0)) for v in self.variables)
+        return "".join(SYMBOLS[assignment[v] - 1] if v in assignment else "." for v in self.variables)
+
+    def print_grid(self, assignment: Assignment) -> None:
+        size, box = self.size, self.box
+        width = max(len(str(size)), 1) if size > len(SYMBOLS) else 1
+        for r in range(size):
+            if r and r % box == 0:
+                print("-" * ((width + 1) * (size + box - 1) - 1))
+            row_vals: List[str] = []
+            for c in range(size):
+                if c and c % box == 0:
+                    row_vals.append("|".rjust(width))
+                v = assignment.get(r * size + c, 0)
+                sym = str(v) if width > 1 else ("." if v == 0 else SYMBOLS[v - 1])
+                row_vals.append(sym.rjust(width))
+            print(" ".join(row_vals))
+
+    # ---------- constraint helpers (C) ----------
+    def consistent(self, var: int, value: int, assignment: Assignment) -> bool:
+        """
+        True if no assigned peer of `var` already holds `value`.
+        """
+        get = assignment.get
+        for p in self.tables.neighbors[var]:
+            if get(p) == value:
+                return False
+        return True
+
+    def conflicts(self, var: int, value: int, assignment: Assignment) -> List[int]:
+        """
+        The assigned peers that stop `var` from taking `value` (for backjumping).
+        """
+        get = assignment.get
+        return [p for p in self.tables.neighbors[var] if get(p) == value]
+
+    def legal_values(self, var: int, assignment: Assignment, domains: DomainMap) -> List[int]:
+        """
+        Values from the domain of `var` not used by any assigned peer.
+        """
+        used = set()
+        for p in self.tables.neighbors[var]:
+            if p in assignment:
+                used.add(assignment[p])
+        return [v for v in domains[var] if v not in used]
+
+    def csp(self, puzzle_rows: Sequence[str]) -> Dict[str, Any]:
+        """
+        Keyword arguments for backtracking_search(**model.csp(rows)).
+        """
+        domains, _ = self.parse(puzzle_rows)
+        legal_values = self.legal_values
+
+        def legal_values_fn(var: int, A: Assignment) -> List[int]:
+            return legal_values(var, A, domains)
+
+        return {
+            "variables": self.variables,
+            "domains": domains,
+            "consistent_fn": self.consistent,
+            "legal_values_fn": legal_values_fn,
+            "neighbors": self.tables.neighbors,
+            "conflicts_fn": self.conflicts,
+        }
@@ -58,9 +58,24 @@ class WolfGoatCabbageProblem:
         new_state = WolfGoatCabbageState(new_f, new_w, new_g, new_c)
         return new_state
 
+    def Predecessors(self, s: WolfGoatCabbageState) -> List[Tuple[WolfGoatCabbageState, str, float]]:
+        """
+        (s_prev, a, cost) for every valid s_prev with Transition(s_prev, a) == s.
+        Every crossing is its own inverse: rowing back the same way undoes it.
+        """
+        preds: List[Tuple[WolfGoatCabbageState, str, float]] = []
+        for a in self.Actions(s):
+            s_prev = self.Transition(s, a)
+            if s_prev.is_valid():
+                preds.append((s_prev, a, self.Cost(s_prev, a, s)))
+        return preds
+
     def GoalTest(self, s: WolfGoatCabbageState) -> bool:
         return s == self.goal
 
+    def GoalStates(self) -> List[WolfGoatCabbageState]:
+        return [self.goal]
+
     def Cost(self, s1: WolfGoatCabbageState, a: str, s2: WolfGoatCabbageState) -> float:
         return 1.0
 
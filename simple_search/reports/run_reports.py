@@ -1,7 +1,7 @@
 from __future__ import annotations
 import argparse
 from simple_search.problems.eight_puzzle import EightPuzzleState, EightPuzzleProblem, UP, DOWN, LEFT, RIGHT
-from simple_search.search.astar import astar, ucs
+from simple_search.search.astar import astar, lazy_astar, partial_expansion_astar, ucs
 from simple_search.heuristics import get_heuristic
 
 ACTION_LABELS = {UP: "Move Up", DOWN: "Move Down", LEFT: "Move Left", RIGHT: "Move Right"}
@@ -16,31 +16,40 @@ def parse_8p_start(s: str) -> EightPuzzleState:
         raise argparse.ArgumentTypeError("start must be a permutation of digits 0-8")
     return state
 
-def print_report(prob, heuristic: str) -> None:
+COMPARE_HEURISTICS = ("ucs", "h1", "h2", "lazy", "pea")
+
+def _one_line(s: EightPuzzleState) -> str:
+    tiles = s.as_tuple()
+    rows = [" ".join(str(tiles[r * 3 + c]) for c in range(3)) for r in range(3)]
+    return " | ".join(rows)
+
+def run_search(prob, heuristic: str, track_memory: bool = False):
     def successors(s):
         for a in prob.Actions(s):
             s2 = prob.Transition(s, a)
             yield (s2, a, 1)
-    
+
     if heuristic == "ucs":
-        result = ucs(prob.start, prob.GoalTest, successors)
-        alg_label = "UCS (h=0)"
-    else:
-        h_func = get_heuristic(heuristic)
-        result = astar(prob.start, prob.GoalTest, successors, h_func, f"A* ({heuristic})")
-        alg_label = f"A* ({heuristic})"
+        return ucs(prob.start, prob.GoalTest, successors, track_memory), "UCS (h=0)"
+    if heuristic == "lazy":
+        # h2 on pop, h1 as the cheap bound at push time
+        h1, h2 = get_heuristic("h1"), get_heuristic("h2")
+        return lazy_astar(prob.start, prob.GoalTest, successors, h2, h1, "Lazy A* (h2)", track_memory), "Lazy (h2)"
+    if heuristic == "pea":
+        return partial_expansion_astar(prob.start, prob.GoalTest, successors, get_heuristic("h2"), "PEA* (h2)", track_memory), "PEA* (h2)"
+    h_func = get_heuristic(heuristic)
+    return astar(prob.start, prob.GoalTest, successors, h_func, f"A* ({heuristic})", track_memory), f"A* ({heuristic})"
+
+def print_report(prob, heuristic: str) -> None:
+    result, alg_label = run_search(prob, heuristic)
 
     print(f"Domain: EightPuzzle | Algorithm: {alg_label}")
     print(f"Solution cost: {result.cost} | Depth: {result.solution_depth}")
-    print(f"Nodes generated: {result.nodes_generated} | Nodes expanded: {result.nodes_expanded} | Max frontier: {result.max_frontier_size}")
+    print(f"Nodes generated: {result.nodes_generated} | Nodes expanded: {result.nodes_expanded} | Max frontier: {result.max_frontier_size} | Closed: {result.max_closed_size}")
+    print(f"Stale pops: {result.stale_pops} | h evaluations: {result.heuristic_evaluations} | Deferred: {result.deferred_evaluations + result.deferred_children}")
     print(f"Runtime: {result.runtime_ms:.2f}ms")
     print("Path:")
 
-    def _one_line_ep(s: EightPuzzleState) -> str:
-        tiles = s.as_tuple()
-        rows = [" ".join(str(tiles[r * 3 + c]) for c in range(3)) for r in range(3)]
-        return " | ".join(rows)
-
     if result.path is None:
         print("  No solution found!")
         return
@@ -48,11 +57,30 @@ def print_report(prob, heuristic: str) -> None:
     for i, (state, action) in enumerate(result.path[1:], start=1):
         label = ACTION_LABELS.get(action, str(action))
         prev_state = result.path[i - 1][0]
-        left = _one_line_ep(prev_state)
-        right = _one_line_ep(state)
+        left = _one_line(prev_state)
+        right = _one_line(state)
         print(f"  {i}) {label:15} {left} -> {right}")
     print()
 
+def print_comparison(prob) -> None:
+    """
+    One row per algorithm, with memory next to time (tracemalloc is on, so
+    runtimes are slower than in the plain reports).
+    """
+    print(f"Start: {_one_line(prob.start)}")
+    header = f"{'Algorithm':<10} {'Cost':>5} {'Expanded':>9} {'Generated':>10} {'Frontier':>9} {'Closed':>7} {'Peak KiB':>9} {'B/node':>7} {'Retained':>8} {'RSS KiB':>8} {'ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for heuristic in COMPARE_HEURISTICS:
+        result, alg_label = run_search(prob, heuristic, track_memory=True)
+        res = result.resources
+        print(
+            f"{alg_label:<10} {result.cost:>5.0f} {result.nodes_expanded:>9} {result.nodes_generated:>10} "
+            f"{result.max_frontier_size:>9} {result.max_closed_size:>7} {res.peak_traced_bytes / 1024:>9.1f} "
+            f"{res.bytes_per_node:>7.0f} {res.retained_blocks:>8} {res.peak_rss_kb:>8} {result.runtime_ms:>9.2f}"
+        )
+    print()
+
 def main(argv: list[str] | None = None) -> None:
     parser = argparse.ArgumentParser(prog="run_reports", description="Run A* reports on 8-puzzle")
     parser.add_argument("--start", type=parse_8p_start, default=None, help="8-puzzle start state as 9-digit string")
@@ -61,9 +89,18 @@ def main(argv: list[str] | None = None) -> None:
     sub.add_parser("ucs", help="Run UCS (h=0)")
     sub.add_parser("h1", help="Run A* with Manhattan Distance")
     sub.add_parser("h2", help="Run A* with Linear Conflict + Manhattan")
+    sub.add_parser("lazy", help="Run Lazy A* (h2 deferred until pop, h1 bound)")
+    sub.add_parser("pea", help="Run Partial-expansion A* with h2")
+    sub.add_parser("compare", help="Compare time and memory of ucs, h1, h2, lazy and pea")
 
     args = parser.parse_args(argv)
 
+    def report(prob) -> None:
+        if args.heuristic == "compare":
+            print_comparison(prob)
+        else:
+            print_report(prob, args.heuristic)
+
     example_starts = [
         EightPuzzleState((1, 2, 3, 4, 5, 6, 7, 8, 0)),  # goal
         EightPuzzleState((1, 2, 3, 4, 5, 6, 7, 0, 8)),  # one move away
@@ -77,14 +114,14 @@ def main(argv: list[str] | None = None) -> None:
             print(f"Invalid start state: {s.as_tuple()}")
             return
         prob = EightPuzzleProblem(start=s)
-        print_report(prob, args.heuristic)
+        report(prob)
     else:
         for s in example_starts:
             if not s.is_valid():
                 print(f"Skipping invalid start state: {s.as_tuple()}")
                 continue
             prob = EightPuzzleProblem(start=s)
-            print_report(prob, args.heuristic)
+            report(prob)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,183 @@
+"""
+sudoku_batch.py
+Solve a corpus of Sudokus, one 81-character puzzle per line ('0' or '.' = empty).
+
+Puzzles are streamed from a file (or stdin), handed to a process pool in
+chunks, and written back in input order as
+
+    <81-char solution or '-'> <search nodes> <milliseconds>
+
+At most `max_pending` chunks are in flight at once, so memory stays bounded
+no matter how large the input is.
+
+    python -m simple_search.reports.sudoku_batch puzzles.txt -o solutions.txt
+    cat puzzles.txt | python -m simple_search.reports.sudoku_batch --engine csp
+"""
+
+from __future__ import annotations
+import argparse
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, List, Optional, TextIO, Tuple, TypeVar
+
+from simple_search.problems.sudoku import (
+    format_solution_line,
+    solve_sudoku_dlx,
+    split_puzzle_line,
+    sudoku_csp,
+)
+from simple_search.search.csp import CSPStats, backtracking_search
+from simple_search.search.dlx import DLXStats
+
+ENGINES = ("dlx", "csp")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def solve_line(line: str, engine: str = "dlx") -> Tuple[Optional[str], int, float]:
+    """
+    Solve one puzzle line. Returns (solution line or None, nodes, milliseconds).
+    """
+    rows = split_puzzle_line(line)
+    start_ns = time.perf_counter_ns()
+    if engine == "dlx":
+        dlx_stats = DLXStats()
+        solution = solve_sudoku_dlx(rows, dlx_stats)
+        nodes = dlx_stats.nodes
+    elif engine == "csp":
+        csp_stats = CSPStats()
+        solution = backtracking_search(**sudoku_csp(rows), stats=csp_stats)
+        nodes = csp_stats.nodes
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
+    elapsed_ms = (time.perf_counter_ns() - start_ns) / 1e6
+    if solution is None:
+        return None, nodes, elapsed_ms
+    return format_solution_line(solution), nodes, elapsed_ms
+
+
+def solve_chunk(lines: List[str], engine: str = "dlx") -> List[str]:
+    """
+    Worker entry point: solve a chunk of lines and return the output lines.
+    """
+    out: List[str] = []
+    for line in lines:
+        try:
+            solution, nodes, ms = solve_line(line, engine)
+        except ValueError:
+            solution, nodes, ms = None, 0, 0.0
+        out.append(f"{solution or '-'} {nodes} {ms:.3f}")
+    return out
+
+
+def read_chunks(stream: TextIO, chunk_size: int) -> Iterator[List[str]]:
+    """
+    Yield lists of up to `chunk_size` non-empty lines without reading ahead.
+    """
+    chunk: List[str] = []
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ordered_pool_map(
+    fn: Callable[..., R],
+    items: Iterable[T],
+    workers: int,
+    max_pending: int,
+    *args,
+) -> Iterator[R]:
+    """
+    Like Pool.imap(fn, items) but never submits more than `max_pending` items
+    ahead of the consumer (imap drains its whole input eagerly). Results come
+    back in input order. workers <= 1 runs everything in this process.
+    """
+    if max_pending < 1:
+        raise ValueError("max_pending must be at least 1")
+    if workers <= 1:
+        for item in items:
+            yield fn(item, *args)
+        return
+
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for item in items:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+            pending.append(pool.submit(fn, item, *args))
+        while pending:
+            yield pending.popleft().result()
+
+
+def solve_stream(
+    in_stream: TextIO,
+    out_stream: TextIO,
+    engine: str = "dlx",
+    workers: int = 1,
+    chunk_size: int = 256,
+    max_pending: Optional[int] = None,
+) -> Tuple[int, int]:
+    """
+    Solve every puzzle in `in_stream`, writing results to `out_stream` in order.
+    Returns (puzzles, solved).
+    """
+    if max_pending is None:
+        max_pending = 4 * max(workers, 1)
+    if chunk_size < 1 or max_pending < 1:
+        raise ValueError("chunk_size and max_pending must be at least 1")
+    puzzles = 0
+    solved = 0
+    chunks = read_chunks(in_stream, chunk_size)
+    for out_lines in ordered_pool_map(solve_chunk, chunks, workers, max_pending, engine):
+        for line in out_lines:
+            puzzles += 1
+            if not line.startswith("-"):
+                solved += 1
+            out_stream.write(line + "\n")
+    return puzzles, solved
+
+
+def positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError("must be at least 1")
+    return value
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="sudoku_batch", description="Solve Sudokus in bulk, one 81-character puzzle per line")
+    parser.add_argument("input", nargs="?", default="-", help="puzzle file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--engine", choices=ENGINES, default="dlx", help="solver to use")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--chunk-size", type=positive_int, default=256, help="puzzles per task")
+    parser.add_argument("--max-pending", type=positive_int, default=None, help="chunks in flight (default: 4 per worker)")
+    args = parser.parse_args(argv)
+
+    in_stream = sys.stdin if args.input == "-" else open(args.input, "r")
+    out_stream = sys.stdout if args.output == "-" else open(args.output, "w")
+    start_ns = time.perf_counter_ns()
+    try:
+        puzzles, solved = solve_stream(in_stream, out_stream, args.engine, args.workers, args.chunk_size, args.max_pending)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+    elapsed_s = (time.perf_counter_ns() - start_ns) / 1e9
+    rate = puzzles / elapsed_s if elapsed_s > 0 else 0.0
+    print(f"Puzzles: {puzzles} | Solved: {solved} | Runtime: {elapsed_s:.2f}s | {rate:.1f} puzzles/s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 import heapq
-from typing import Tuple, List, Optional, Callable, Any
+from typing import Tuple, List, Optional, Callable, Any, Dict
 import time
 
+from simple_search.search.checkpoint import Checkpointer, CheckpointStats
+from simple_search.search.resources import ResourceMeter, ResourceUsage
+
 class AStarResult:
     def __init__(self):
         self.path: Optional[List[Tuple[Any, Any]]] = None
@@ -9,86 +12,324 @@ class AStarResult:
         self.nodes_expanded: int = 0
         self.nodes_generated: int = 0
         self.max_frontier_size: int = 0
+        self.max_closed_size: int = 0
         self.solution_depth: int = 0
+        self.runtime_ns: int = 0
         self.runtime_ms: float = 0.0
         self.heuristic_name: str = ""
+        self.stale_pops: int = 0             # popped entries for states already closed or improved
+        self.heuristic_evaluations: int = 0  # calls to h
+        self.deferred_evaluations: int = 0   # h calls lazy_astar avoided (state never evaluated)
+        self.deferred_children: int = 0      # children partial_expansion_astar generated but did not store
+        self.resources: Optional[ResourceUsage] = None  # set when track_memory=True
+        self.checkpoints: Optional[CheckpointStats] = None  # set when a Checkpointer is used
 
-def astar(start, goal_test: Callable, successors: Callable, h: Callable, heuristic_name: str = "A*") -> AStarResult:
+    def finish(self, start_ns: int, meter: Optional[ResourceMeter] = None) -> None:
+        self.runtime_ns = time.perf_counter_ns() - start_ns
+        self.runtime_ms = self.runtime_ns / 1e6
+        if meter is not None:
+            self.resources = meter.stop(self.max_frontier_size + self.max_closed_size)
 
-    start_time = time.time()
-    result = AStarResult()
-    result.heuristic_name = heuristic_name
+def astar(
+    start,
+    goal_test: Callable,
+    successors: Callable,
+    h: Callable,
+    heuristic_name: str = "A*",
+    track_memory: bool = False,
+    checkpointer: Optional[Checkpointer] = None,
+    resume: Optional[Dict[str, Any]] = None,
+) -> AStarResult:
+    """
+    checkpointer: save the frontier, best_g / parent tables and counters
+    periodically. resume: a load_checkpoint(path, "astar") result; the search
+    continues from that point (with the same goal_test / successors / h).
+    """
+    start_ns = time.perf_counter_ns()
+    meter = ResourceMeter(track_memory).start()
+    try:
+        result = AStarResult()
+        result.heuristic_name = heuristic_name
     
 
-    frontier = [(h(start), 0, 0, start)]
-    heapq.heapify(frontier)
+        frontier = [(h(start), 0, 0, start)]
+        heapq.heapify(frontier)
+        result.heuristic_evaluations = 1
     
-    # Closed set with best_g[state] to handle reopens
-    best_g = {start: 0}  # best known g-cost for each state
-    parent = {start: None}
-    parent_action = {start: None}
+        # Closed set with best_g[state] to handle reopens
+        best_g = {start: 0}  # best known g-cost for each state
+        parent = {start: None}
+        parent_action = {start: None}
     
-    # Metrics tracking
-    nodes_generated = 1  # start node
-    counter = 1  # for tie-breaking in heap
-    visited = set()  # closed set for graph search
+        # Metrics tracking
+        nodes_generated = 1  # start node
+        counter = 1  # for tie-breaking in heap
+        visited = set()  # closed set for graph search
+
+        if resume is not None:
+            frontier, best_g, parent, parent_action, visited = (
+                resume["frontier"], resume["best_g"], resume["parent"], resume["parent_action"], resume["visited"])
+            nodes_generated, counter = resume["nodes_generated"], resume["counter"]
+            result.nodes_expanded, result.max_frontier_size, result.stale_pops, result.heuristic_evaluations = resume["counters"]
+        if checkpointer is not None:
+            result.checkpoints = checkpointer.stats
     
-    while frontier:
-        # Track max frontier size
-        result.max_frontier_size = max(result.max_frontier_size, len(frontier))
+        while frontier:
+            if checkpointer is not None and checkpointer.due():
+                checkpointer.save("astar", {
+                    "frontier": frontier, "best_g": best_g, "parent": parent,
+                    "parent_action": parent_action, "visited": visited,
+                    "nodes_generated": nodes_generated, "counter": counter,
+                    "counters": (result.nodes_expanded, result.max_frontier_size,
+                                 result.stale_pops, result.heuristic_evaluations),
+                })
+
+            # Track max frontier size
+            result.max_frontier_size = max(result.max_frontier_size, len(frontier))
         
-        # Pop state with minimum f(n) = g(n) + h(n)
-        f, g, _, s = heapq.heappop(frontier)
+            # Pop state with minimum f(n) = g(n) + h(n)
+            f, g, _, s = heapq.heappop(frontier)
         
-        # Skip if we've already found a better path to this state
-        if s in best_g and g > best_g[s]:
-            continue
+            # Skip if we've already found a better path to this state
+            if s in best_g and g > best_g[s]:
+                result.stale_pops += 1
+                continue
             
-        # Skip if already visited (graph search)
-        if s in visited:
-            continue
+            # Skip if already visited (graph search)
+            if s in visited:
+                result.stale_pops += 1
+                continue
             
-        # Add to closed set
-        visited.add(s)
-        result.nodes_expanded += 1
+            # Add to closed set
+            visited.add(s)
+            result.nodes_expanded += 1
         
-        # Check if goal reached
-        if goal_test(s):
-            # Reconstruct path
-            path = []
-            cur = s
-            while cur is not None:
-                path.append((cur, parent_action[cur]))
-                cur = parent[cur]
-            path.reverse()
+            # Check if goal reached
+            if goal_test(s):
+                # Reconstruct path
+                path = []
+                cur = s
+                while cur is not None:
+                    path.append((cur, parent_action[cur]))
+                    cur = parent[cur]
+                path.reverse()
             
-            result.path = path
-            result.cost = g
-            result.solution_depth = len(path) - 1  # depth = path length - 1
-            result.nodes_generated = nodes_generated
-            result.runtime_ms = (time.time() - start_time) * 1000
-            return result
+                result.path = path
+                result.cost = g
+                result.solution_depth = len(path) - 1  # depth = path length - 1
+                result.nodes_generated = nodes_generated
+                result.max_closed_size = len(visited)
+                result.finish(start_ns, meter)
+                return result
         
-        # Generate successors
-        for s2, action, step_cost in successors(s):
-            nodes_generated += 1
-            g2 = g + step_cost
+            # Generate successors
+            for s2, action, step_cost in successors(s):
+                nodes_generated += 1
+                g2 = g + step_cost
             
-            # Only consider if we found a better path to s2
-            if s2 not in best_g or g2 < best_g[s2]:
-                best_g[s2] = g2
-                parent[s2] = s
-                parent_action[s2] = action
+                # Only consider if we found a better path to s2
+                if s2 not in best_g or g2 < best_g[s2]:
+                    best_g[s2] = g2
+                    parent[s2] = s
+                    parent_action[s2] = action
                 
-                # Add to frontier with f(n) = g(n) + h(n)
+                    # Add to frontier with f(n) = g(n) + h(n)
+                    f2 = g2 + h(s2)
+                    result.heuristic_evaluations += 1
+                    heapq.heappush(frontier, (f2, g2, counter, s2))
+                    counter += 1
+    
+        # No solution found
+        result.nodes_generated = nodes_generated
+        result.max_closed_size = len(visited)
+        result.finish(start_ns, meter)
+        return result
+    finally:
+        meter.stop()  # no-op unless the search raised
+
+def _reconstruct(result: AStarResult, s, g, parent: dict, parent_action: dict) -> None:
+    path = []
+    cur = s
+    while cur is not None:
+        path.append((cur, parent_action[cur]))
+        cur = parent[cur]
+    path.reverse()
+    result.path = path
+    result.cost = g
+    result.solution_depth = len(path) - 1
+
+def lazy_astar(
+    start,
+    goal_test: Callable,
+    successors: Callable,
+    h: Callable,
+    cheap_h: Optional[Callable] = None,
+    heuristic_name: str = "Lazy A*",
+    track_memory: bool = False,
+) -> AStarResult:
+    """
+    A* that defers h until a state is popped (Lazy A*).
+
+    A child is pushed with a lower bound on its f instead of h(child):
+    max(f(parent), g(child) + cheap_h(child)) -- f(parent) is a lower bound
+    when h is consistent, cheap_h is an optional cheaper admissible heuristic.
+    When such an entry comes off the heap, h is evaluated and the entry
+    re-queued with its real f if that is higher. Entries that turn out stale
+    never cost an h call (result.deferred_evaluations).
+
+    Same successors(s) -> (s2, action, cost) and h(s) contract as astar().
+    """
+    start_ns = time.perf_counter_ns()
+    meter = ResourceMeter(track_memory).start()
+    try:
+        result = AStarResult()
+        result.heuristic_name = heuristic_name
+
+        # entries: (f or lower bound, g, counter, state, evaluated)
+        frontier = [(h(start), 0, 0, start, True)]
+        result.heuristic_evaluations = 1
+        best_g = {start: 0}
+        parent = {start: None}
+        parent_action = {start: None}
+        nodes_generated = 1
+        counter = 1
+        visited = set()
+        pushed_lazy = 0
+        evaluated_lazy = 0
+
+        while frontier:
+            result.max_frontier_size = max(result.max_frontier_size, len(frontier))
+            f, g, _, s, evaluated = heapq.heappop(frontier)
+
+            if g > best_g[s] or s in visited:
+                result.stale_pops += 1
+                continue
+
+            if not evaluated:
+                # first time this entry reaches the top: pay for h now
+                evaluated_lazy += 1
+                result.heuristic_evaluations += 1
+                f_real = g + h(s)
+                if f_real > f:
+                    heapq.heappush(frontier, (f_real, g, counter, s, True))
+                    counter += 1
+                    continue
+
+            visited.add(s)
+            result.nodes_expanded += 1
+
+            if goal_test(s):
+                _reconstruct(result, s, g, parent, parent_action)
+                break
+
+            for s2, action, step_cost in successors(s):
+                nodes_generated += 1
+                g2 = g + step_cost
+                if s2 not in best_g or g2 < best_g[s2]:
+                    best_g[s2] = g2
+                    parent[s2] = s
+                    parent_action[s2] = action
+                    bound = f
+                    if cheap_h is not None:
+                        bound = max(bound, g2 + cheap_h(s2))
+                    heapq.heappush(frontier, (bound, g2, counter, s2, False))
+                    counter += 1
+                    pushed_lazy += 1
+
+        result.deferred_evaluations = pushed_lazy - evaluated_lazy
+        result.nodes_generated = nodes_generated
+        result.max_closed_size = len(visited)
+        result.finish(start_ns, meter)
+        return result
+    finally:
+        meter.stop()  # no-op unless the search raised
+
+def partial_expansion_astar(
+    start,
+    goal_test: Callable,
+    successors: Callable,
+    h: Callable,
+    heuristic_name: str = "PEA*",
+    track_memory: bool = False,
+) -> AStarResult:
+    """
+    Partial-expansion A* (PEA*): expanding a state stores only the children
+    whose f equals the state's current value F; the state itself goes back
+    on the heap with F = the smallest f among the children left out.
+    Children with f above the optimal cost are never stored, which keeps the
+    frontier small at the price of regenerating children on re-expansion
+    (result.deferred_children counts those left out).
+
+    Ties on F go to the deeper entry, so the re-queued parents of the last
+    f layer are not swept breadth-first before the goal is reached.
+
+    nodes_expanded counts every (partial) expansion; max_closed_size the
+    distinct states expanded. Same contract as astar().
+    """
+    start_ns = time.perf_counter_ns()
+    meter = ResourceMeter(track_memory).start()
+    try:
+        result = AStarResult()
+        result.heuristic_name = heuristic_name
+
+        inf = float("inf")
+        # entries: (F, -g, counter, state, F of the previous expansion of this entry)
+        frontier = [(h(start), 0, 0, start, -inf)]
+        result.heuristic_evaluations = 1
+        best_g = {start: 0}
+        parent = {start: None}
+        parent_action = {start: None}
+        nodes_generated = 1
+        counter = 1
+        visited = set()
+
+        while frontier:
+            result.max_frontier_size = max(result.max_frontier_size, len(frontier))
+            F, neg_g, _, s, done_F = heapq.heappop(frontier)
+            g = -neg_g
+
+            # a fresh entry for a closed state, or a path that has since improved
+            if g > best_g[s] or (done_F == -inf and s in visited):
+                result.stale_pops += 1
+                continue
+
+            visited.add(s)
+            result.nodes_expanded += 1
+
+            if goal_test(s):
+                _reconstruct(result, s, g, parent, parent_action)
+                break
+
+            next_F = inf
+            for s2, action, step_cost in successors(s):
+                nodes_generated += 1
+                g2 = g + step_cost
                 f2 = g2 + h(s2)
-                heapq.heappush(frontier, (f2, g2, counter, s2))
+                result.heuristic_evaluations += 1
+                if f2 <= done_F:
+                    continue  # stored by an earlier expansion of s
+                if f2 > F:
+                    result.deferred_children += 1
+                    next_F = min(next_F, f2)
+                    continue
+                if s2 not in best_g or g2 < best_g[s2]:
+                    best_g[s2] = g2
+                    parent[s2] = s
+                    parent_action[s2] = action
+                    heapq.heappush(frontier, (f2, -g2, counter, s2, -inf))
+                    counter += 1
+
+            if next_F < inf:
+                # re-queue s for the next band of children
+                heapq.heappush(frontier, (next_F, -g, counter, s, F))
                 counter += 1
-    
-    # No solution found
-    result.nodes_generated = nodes_generated
-    result.runtime_ms = (time.time() - start_time) * 1000
-    return result
 
-def ucs(start, goal_test: Callable, successors: Callable) -> AStarResult:
-    return astar(start, goal_test, successors, lambda s: 0, "UCS (h=0)")
+        result.nodes_generated = nodes_generated
+        result.max_closed_size = len(visited)
+        result.finish(start_ns, meter)
+        return result
+    finally:
+        meter.stop()  # no-op unless the search raised
+
+def ucs(start, goal_test: Callable, successors: Callable, track_memory: bool = False) -> AStarResult:
+    return astar(start, goal_test, successors, lambda s: 0, "UCS (h=0)", track_memory)
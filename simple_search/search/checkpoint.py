@@ -0,0 +1,113 @@
+"""
+checkpoint.py
+Periodic checkpoints for long-running searches, so a preempted run can
+resume where it stopped instead of starting over.
+
+astar(), ids() / depth_limited_search() and backtracking_search() (plain and
+incremental-MRV modes) take a Checkpointer; every `interval_s` seconds they
+save their whole engine state (frontier, best_g / parent tables, IDS limit
+and stack, or the CSP trail). To resume, load the file and hand it back:
+
+    cp = Checkpointer("run.ckpt", interval_s=30)
+    result = astar(start, goal_test, successors, h, checkpointer=cp)
+    ...  # preempted; in the new process:
+    result = astar(start, goal_test, successors, h, checkpointer=cp,
+                   resume=load_checkpoint("run.ckpt", "astar"))
+
+The file is a short header plus the state pickled and zlib-compressed. It is
+written to a temporary file first and moved into place with os.replace, so a
+crash mid-write leaves the previous checkpoint intact. Checkpointer.stats
+records how many saves were made, their size, and the time spent saving.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import os
+import pickle
+import time
+import zlib
+from typing import Any, Dict, Optional
+
+MAGIC = b"SSCKPT1\n"
+
+
+@dataclass
+class CheckpointStats:
+    saves: int = 0
+    bytes_written: int = 0
+    last_size_bytes: int = 0
+    save_ns: int = 0        # total time spent pickling, compressing and writing
+    max_save_ns: int = 0
+
+    @property
+    def save_ms(self) -> float:
+        return self.save_ns / 1e6
+
+
+class Checkpointer:
+    def __init__(self, path: str, interval_s: float = 60.0, check_every: int = 1024, level: int = 1):
+        """
+        path: checkpoint file; interval_s: seconds between saves.
+        The clock is only read every `check_every` calls to due(), so asking
+        is cheap enough for an inner loop. level: zlib compression level.
+        """
+        if interval_s < 0:
+            raise ValueError("interval_s must be non-negative")
+        self.path = path
+        self.interval_ns = int(interval_s * 1e9)
+        self.check_every = max(check_every, 1)
+        self.level = level
+        self.stats = CheckpointStats()
+        self._calls = 0
+        self._next_ns = time.perf_counter_ns() + self.interval_ns
+
+    def due(self) -> bool:
+        self._calls += 1
+        if self._calls < self.check_every:
+            return False
+        self._calls = 0
+        return time.perf_counter_ns() >= self._next_ns
+
+    def save(self, kind: str, state: Dict[str, Any]) -> None:
+        """
+        Write {"kind": kind, **state} atomically.
+        """
+        start_ns = time.perf_counter_ns()
+        payload = zlib.compress(pickle.dumps({"kind": kind, **state}, protocol=pickle.HIGHEST_PROTOCOL), self.level)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        end_ns = time.perf_counter_ns()
+        size = len(MAGIC) + len(payload)
+        s = self.stats
+        s.saves += 1
+        s.bytes_written += size
+        s.last_size_bytes = size
+        s.save_ns += end_ns - start_ns
+        s.max_save_ns = max(s.max_save_ns, end_ns - start_ns)
+        self._next_ns = end_ns + self.interval_ns
+
+    def remove(self) -> None:
+        """
+        Delete the checkpoint file (e.g. once the search has finished).
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def load_checkpoint(path: str, kind: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Read a checkpoint written by Checkpointer.save. With `kind`, raise
+    ValueError if it was written by a different engine.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a checkpoint file: {path}")
+        state = pickle.loads(zlib.decompress(f.read()))
+    if kind is not None and state.get("kind") != kind:
+        raise ValueError(f"Checkpoint {path} is for {state.get('kind')!r}, not {kind!r}")
+    return state
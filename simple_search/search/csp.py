@@ -5,19 +5,62 @@ A tiny, readable CSP backtracking solver with MRV.
 We follow the class pseudocode structure:
 
 SELECT-UNASSIGNED-VARIABLE(A, X, C): pick var with minimum legal values (MRV)
-ORDER-DOMAIN-VALUES(X_i, A, D, C): return domain values in simple order
+ORDER-DOMAIN-VALUES(X_i, A, D, C): return domain values in simple order (or LCV)
 CONSISTENT(X_i <- v, A, C): check constraints with current partial assignment
 BACKTRACK(A): depth-first search with backtracking
 
 This file is *generic* except for the 'legal_values_fn' and 'consistent_fn'
 which are provided by the problem (e.g., sudoku.py).
+
+A problem that also declares its constraint graph ('neighbors': variable ->
+variables sharing a constraint with it) gets incremental MRV (MRVBuckets):
+only the neighbors of the variable just assigned are re-counted, instead of
+rescanning every variable at every step.
+
+On top of that graph, backtracking_search can run conflict-directed
+backjumping (CBJ): each variable keeps a conflict set of the earlier
+assignments that ruled its values out, and a dead end jumps straight back to
+the most recent of them. Exhausted conflict sets are learned as nogoods
+(bounded NogoodStore), and an optional Luby/geometric restart policy with
+randomized MRV tie-breaking cuts heavy-tailed run times.
 """
 
-from typing import Dict, List, Callable, Optional, Any
+import random
+from collections import deque
+from dataclasses import dataclass
+import time
+from typing import Deque, Dict, FrozenSet, Iterable, List, Callable, Optional, Any, Set, Tuple
+
+from simple_search.search.checkpoint import Checkpointer, CheckpointStats
+from simple_search.search.resources import ResourceMeter, ResourceUsage
 
 
 Assignment = Dict[str, int]              # e.g., {"r1c1": 5, ...}
 DomainMap  = Dict[str, List[int]]        # e.g., {"r1c1": [1..9], "r1c2": [1..9], ...}
+Neighbors  = Dict[str, Iterable[str]]    # e.g., {"r1c1": {"r1c2", ..., "r3c3"}, ...}
+# Variables only need to be hashable: sudoku_nxn.py uses int cell ids, and any
+# sequence indexable by variable (e.g. a list of peer views) works as Neighbors.
+
+# value orderings
+SIMPLE = "simple"
+LCV = "lcv"
+
+# restart policies
+LUBY = "luby"
+GEOMETRIC = "geometric"
+
+
+@dataclass
+class CSPStats:
+    nodes: int = 0          # values assigned (search tree nodes)
+    backtracks: int = 0     # dead ends: a variable ran out of values
+    backjumps: int = 0      # levels skipped by conflict-directed backjumping
+    nogoods_learned: int = 0
+    nogood_prunes: int = 0  # values rejected by a learned nogood
+    restarts: int = 0
+    runtime_ns: int = 0
+    resources: Optional[ResourceUsage] = None  # set when track_memory=True
+    checkpoints: Optional[CheckpointStats] = None  # set when a Checkpointer is used
 
 
 def select_unassigned_variable_mrv(
@@ -51,49 +94,467 @@ def select_unassigned_variable_mrv(
     return best_var
 
 
+class MRVBuckets:
+    """
+    Incremental MRV. Unassigned variables sit in buckets keyed by their count of
+    legal values; assigning a variable only re-counts its unassigned neighbors.
+    Ties go to the variable with the most unassigned neighbors (degree heuristic),
+    then to the earliest in `variables`, or a random one if an rng is given.
+    Tie-breaking never depends on the order of past assign/unassign calls, so
+    replaying a trail (checkpoint resume) makes the same choices as the
+    original run.
+
+    assign()/unassign() must be called in LIFO order, as backtracking does.
+    """
+
+    def __init__(
+        self,
+        variables: List[str],
+        neighbors: Neighbors,
+        legal_values_fn: Callable[[str, Assignment], List[int]],
+        assignment: Assignment,
+        rng: Optional[random.Random] = None,
+    ):
+        self.neighbors = neighbors
+        self.legal_values_fn = legal_values_fn
+        self.rng = rng  # if set, remaining ties are broken at random
+        self.count: Dict[str, int] = {}
+        self.degree: Dict[str, int] = {}
+        self.position: Dict[str, int] = {v: i for i, v in enumerate(variables)}
+        for v in variables:
+            if v in assignment:
+                continue
+            self.count[v] = len(legal_values_fn(v, assignment))
+            self.degree[v] = sum(1 for n in neighbors[v] if n not in assignment)
+        size = max(self.count.values(), default=0) + 1
+        # dicts used as sets; ties are broken by position, not insertion order
+        self.buckets: List[Dict[str, None]] = [{} for _ in range(size)]
+        for v, c in self.count.items():
+            self.buckets[c][v] = None
+        self._trail: List[Tuple[str, Tuple[int, int], List[Tuple[str, int]]]] = []
+
+    def __len__(self) -> int:
+        return len(self.count)
+
+    def select(self) -> str:
+        degree, position = self.degree, self.position
+        for bucket in self.buckets:
+            if bucket:
+                if self.rng is None:
+                    return max(bucket, key=lambda v: (degree[v], -position[v]))
+                best = max(degree[v] for v in bucket)
+                return self.rng.choice(sorted((v for v in bucket if degree[v] == best), key=position.__getitem__))
+        return ""
+
+    def _put(self, var: str, c: int) -> None:
+        while c >= len(self.buckets):
+            self.buckets.append({})
+        self.buckets[c][var] = None
+        self.count[var] = c
+
+    def assign(self, var: str, assignment: Assignment) -> None:
+        """
+        Call right after assignment[var] has been set.
+        """
+        count, degree, buckets = self.count, self.degree, self.buckets
+        own = (count.pop(var), degree.pop(var))
+        del buckets[own[0]][var]
+        changed: List[Tuple[str, int]] = []
+        for n in self.neighbors[var]:
+            if n not in count:
+                continue
+            degree[n] -= 1
+            old = count[n]
+            new = len(self.legal_values_fn(n, assignment))
+            if new != old:
+                del buckets[old][n]
+                self._put(n, new)
+            changed.append((n, old))
+        self._trail.append((var, own, changed))
+
+    def unassign(self, var: str) -> None:
+        """
+        Undo the matching assign().
+        """
+        top, (own_count, own_degree), changed = self._trail.pop()
+        assert top == var, "MRVBuckets.unassign out of order"
+        count, degree, buckets = self.count, self.degree, self.buckets
+        for n, old in changed:
+            degree[n] += 1
+            cur = count[n]
+            if cur != old:
+                del buckets[cur][n]
+                buckets[old][n] = None
+                count[n] = old
+        degree[var] = own_degree
+        self._put(var, own_count)
+
+
 def order_domain_values_simple(var: str, domains: DomainMap) -> List[int]:
     """
-    Return values in the variable's domain as-is (no LCV here for simplicity).
+    Return values in the variable's domain as-is.
     """
     return list(domains[var])
 
 
+def order_domain_values_lcv(
+    var: str,
+    assignment: Assignment,
+    domains: DomainMap,
+    legal_values_fn: Callable[[str, Assignment], List[int]],
+    neighbors: Iterable[str],
+) -> List[int]:
+    """
+    LCV: values that leave the most legal values to the unassigned neighbors first.
+    """
+    others = [n for n in neighbors if n not in assignment and n != var]
+    scores: Dict[int, int] = {v: -1 for v in domains[var]}  # illegal values go last
+    for value in legal_values_fn(var, assignment):
+        assignment[var] = value
+        scores[value] = sum(len(legal_values_fn(n, assignment)) for n in others)
+        del assignment[var]
+    return sorted(domains[var], key=lambda v: -scores[v])
+
+
+class NogoodStore:
+    """
+    Bounded store of learned nogoods: sets of (variable, value) pairs that can
+    never all hold together. Oldest nogoods are evicted first, and nogoods with
+    more than `max_size` pairs are not kept (they rarely match again and are
+    costly to check).
+    """
+
+    def __init__(self, capacity: int, max_size: int = 10):
+        self.capacity = capacity
+        self.max_size = max_size
+        self._order: Deque[FrozenSet[Tuple[str, int]]] = deque()
+        self._index: Dict[Tuple[str, int], List[FrozenSet[Tuple[str, int]]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def learn(self, nogood: FrozenSet[Tuple[str, int]]) -> bool:
+        if self.capacity <= 0 or not nogood or len(nogood) > self.max_size:
+            return False
+        if nogood in self._index.get(next(iter(nogood)), ()):
+            return False
+        if len(self._order) >= self.capacity:
+            old = self._order.popleft()
+            for lit in old:
+                bucket = self._index[lit]
+                bucket.remove(old)
+                if not bucket:
+                    del self._index[lit]
+        self._order.append(nogood)
+        for lit in nogood:
+            self._index.setdefault(lit, []).append(nogood)
+        return True
+
+    def violated(self, var: str, value: int, assignment: Assignment) -> Optional[FrozenSet[Tuple[str, int]]]:
+        """
+        A stored nogood that var=value would complete under `assignment`, if any.
+        """
+        for nogood in self._index.get((var, value), ()):
+            if all(x == var or (x in assignment and assignment[x] == v) for x, v in nogood):
+                return nogood
+        return None
+
+
+def luby(i: int) -> int:
+    """
+    i-th term (1-based) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ...
+    """
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if i == (1 << k) - 1:
+        return 1 << (k - 1)
+    return luby(i - (1 << (k - 1)) + 1)
+
+
+def restart_cutoff(policy: Optional[str], run: int, base: int, factor: float) -> Optional[int]:
+    """
+    Dead ends allowed in restart run `run` (0-based); None means never restart.
+    Raises ValueError for a base below 1 or a shrinking geometric factor,
+    which would cut runs down to nothing and restart forever.
+    """
+    if policy is None:
+        return None
+    if base < 1:
+        raise ValueError(f"restart_base must be at least 1, got {base}")
+    if policy == GEOMETRIC and factor < 1:
+        raise ValueError(f"restart_factor must be at least 1 for geometric restarts, got {factor}")
+    if policy == LUBY:
+        return base * luby(run + 1)
+    if policy == GEOMETRIC:
+        return int(base * factor ** run)
+    raise ValueError(f"Unknown restart policy: {policy}")
+
+
 def backtracking_search(
     variables: List[str],
     domains: DomainMap,
     consistent_fn: Callable[[str, int, Assignment], bool],
     legal_values_fn: Callable[[str, Assignment], List[int]],
+    stats: Optional[CSPStats] = None,
+    neighbors: Optional[Neighbors] = None,
+    value_order: str = SIMPLE,
+    backjump: bool = False,
+    conflicts_fn: Optional[Callable[[str, int, Assignment], Iterable[str]]] = None,
+    max_nogoods: int = 0,
+    max_nogood_size: int = 10,
+    restarts: Optional[str] = None,
+    restart_base: int = 100,
+    restart_factor: float = 1.5,
+    seed: Optional[int] = None,
+    track_memory: bool = False,
+    checkpointer: Optional[Checkpointer] = None,
+    resume: Optional[Dict[str, Any]] = None,
 ) -> Optional[Assignment]:
     """
     Backtracking search with MRV, matching the class pseudocode structure.
+    Pass a CSPStats to have node/backtrack counts filled in.
+
+    neighbors: the problem's constraint graph; enables incremental MRV.
+    value_order: SIMPLE (domain order) or LCV (least-constraining value).
+
+    Conflict-directed mode (needs neighbors), used if any of these are set:
+      backjump: jump back to the most recent culprit instead of one level.
+      conflicts_fn(var, value, A): the assigned variables that make var=value
+        inconsistent (default: all assigned neighbors of var).
+      max_nogoods: how many learned nogoods to keep (0 = don't learn);
+        only nogoods of at most max_nogood_size assignments are learned.
+      restarts: LUBY or GEOMETRIC; a run is cut off after restart_base
+        (times the policy's multiplier) dead ends. Ties in MRV are then broken
+        at random, seeded by `seed`.
+
+    track_memory: fill stats.resources (peak traced memory etc.).
+
+    checkpointer: periodically save the search trail (plain and incremental
+      MRV modes only). resume: a load_checkpoint(path, "csp") result; pass the
+      same problem and options and the search replays the saved trail, then
+      carries on with the next untried value.
     """
+    if stats is None:
+        stats = CSPStats()
+    start_ns = time.perf_counter_ns()
+    meter = ResourceMeter(track_memory).start()
+    try:
+        return _backtracking_search(
+            variables, domains, consistent_fn, legal_values_fn, stats, neighbors, value_order,
+            backjump, conflicts_fn, max_nogoods, max_nogood_size, restarts, restart_base,
+            restart_factor, seed, checkpointer, resume,
+        )
+    finally:
+        stats.runtime_ns = time.perf_counter_ns() - start_ns
+        stats.resources = meter.stop(len(variables))
+
+
+def _backtracking_search(
+    variables: List[str],
+    domains: DomainMap,
+    consistent_fn: Callable[[str, int, Assignment], bool],
+    legal_values_fn: Callable[[str, Assignment], List[int]],
+    stats: CSPStats,
+    neighbors: Optional[Neighbors],
+    value_order: str,
+    backjump: bool,
+    conflicts_fn: Optional[Callable[[str, int, Assignment], Iterable[str]]],
+    max_nogoods: int,
+    max_nogood_size: int,
+    restarts: Optional[str],
+    restart_base: int,
+    restart_factor: float,
+    seed: Optional[int],
+    checkpointer: Optional[Checkpointer] = None,
+    resume: Optional[Dict[str, Any]] = None,
+) -> Optional[Assignment]:
+    if value_order not in (SIMPLE, LCV):
+        raise ValueError(f"Unknown value order: {value_order}")
+
+    def order_values(var: str, A: Assignment) -> List[int]:
+        if value_order == LCV:
+            return order_domain_values_lcv(var, A, domains, legal_values_fn, neighbors[var] if neighbors is not None else variables)
+        return order_domain_values_simple(var, domains)
+
+    if backjump or max_nogoods > 0 or restarts is not None:
+        if checkpointer is not None or resume is not None:
+            raise ValueError("Checkpointing supports plain and incremental-MRV search only")
+        if neighbors is None:
+            raise ValueError("Conflict-directed search needs the constraint graph (neighbors)")
+        return _conflict_directed_search(
+            variables, consistent_fn, legal_values_fn, neighbors, order_values, stats, backjump,
+            conflicts_fn, max_nogoods, max_nogood_size, restarts, restart_base, restart_factor, seed,
+        )
+
     # Start with an empty partial assignment
     assignment: Assignment = {}
+    buckets = MRVBuckets(variables, neighbors, legal_values_fn, assignment) if neighbors is not None else None
+
+    # trail: one [var, ordered values, index of the value being tried] per level
+    trail: List[List[Any]] = []
+    replay: List[List[Any]] = []
+    if resume is not None:
+        replay = resume["trail"]
+        counts = resume["stats"]
+        stats.nodes, stats.backtracks = counts.nodes, counts.backtracks
+    if checkpointer is not None:
+        stats.checkpoints = checkpointer.stats
 
     def backtrack(A: Assignment) -> Optional[Assignment]:
         # Goal test: complete assignment
         if len(A) == len(variables):
             return A
 
-        # 1) SELECT-UNASSIGNED-VARIABLE using MRV
-        var = select_unassigned_variable_mrv(A, variables, domains, legal_values_fn)
-        if var == "":
-            return None  # Safety (shouldn't happen if goal test is correct)
+        if checkpointer is not None and checkpointer.due():
+            checkpointer.save("csp", {"trail": trail, "stats": stats})
+
+        depth = len(trail)
+        if depth < len(replay):
+            # resuming: this level's variable and values come from the checkpoint
+            var, values, first = replay[depth]
+        else:
+            # 1) SELECT-UNASSIGNED-VARIABLE using MRV
+            if buckets is not None:
+                var = buckets.select()
+            else:
+                var = select_unassigned_variable_mrv(A, variables, domains, legal_values_fn)
+            if var == "":
+                return None  # Safety (shouldn't happen if goal test is correct)
+
+            # 2) ORDER-DOMAIN-VALUES
+            values, first = order_values(var, A), 0
 
-        # 2) ORDER-DOMAIN-VALUES (simple order; no LCV)
-        for value in order_domain_values_simple(var, domains):
+        frame = [var, values, first]
+        trail.append(frame)
+        replaying = depth < len(replay)
+        for i in range(first, len(values)):
+            value = values[i]
+            frame[2] = i
             # 3) CONSISTENT?
             if consistent_fn(var, value, A):
                 # choose
                 A[var] = value
+                if not replaying:
+                    stats.nodes += 1  # counted before the checkpoint was taken
+                replaying = False
+                if buckets is not None:
+                    buckets.assign(var, A)
                 # recurse
                 result = backtrack(A)
                 if result is not None:
                     return result
                 # undo
                 del A[var]
+                if buckets is not None:
+                    buckets.unassign(var)
+            if depth < len(replay):
+                # past the saved value: the rest of this level searches normally
+                del replay[depth:]
+        trail.pop()
 
         # dead end
+        stats.backtracks += 1
         return None
 
     return backtrack(assignment)
+
+
+class _Restart:
+    pass
+
+
+_RESTART = _Restart()
+
+
+def _conflict_directed_search(
+    variables: List[str],
+    consistent_fn: Callable[[str, int, Assignment], bool],
+    legal_values_fn: Callable[[str, Assignment], List[int]],
+    neighbors: Neighbors,
+    order_values: Callable[[str, Assignment], List[int]],
+    stats: CSPStats,
+    backjump: bool,
+    conflicts_fn: Optional[Callable[[str, int, Assignment], Iterable[str]]],
+    max_nogoods: int,
+    max_nogood_size: int,
+    restarts: Optional[str],
+    restart_base: int,
+    restart_factor: float,
+    seed: Optional[int],
+) -> Optional[Assignment]:
+    """
+    CBJ with incremental MRV, nogood learning and restarts.
+
+    backtrack() returns a complete assignment, _RESTART, or the conflict set of
+    a dead end: the assigned variables that together leave it no value.
+    With backjump=True, a level whose variable is not in that set is skipped
+    (a backjump); otherwise the set is merged into the level's own conflict
+    set and the next value is tried (chronological backtracking, still
+    learning nogoods and restarting).
+    """
+    if conflicts_fn is None:
+        def conflicts_fn(var: str, value: int, A: Assignment) -> Iterable[str]:
+            return [n for n in neighbors[var] if n in A]
+
+    nogoods = NogoodStore(max_nogoods, max_nogood_size)
+    rng = random.Random(seed) if (restarts is not None or seed is not None) else None
+    n_vars = len(variables)
+    run = 0
+
+    while True:
+        cutoff = restart_cutoff(restarts, run, restart_base, restart_factor)
+        failures = 0
+        assignment: Assignment = {}
+        buckets = MRVBuckets(variables, neighbors, legal_values_fn, assignment, rng)
+
+        def backtrack(A: Assignment) -> Any:
+            nonlocal failures
+            if len(A) == n_vars:
+                return A
+
+            var = buckets.select()
+            conflict: Set[str] = set()
+            for value in order_values(var, A):
+                if not consistent_fn(var, value, A):
+                    conflict.update(conflicts_fn(var, value, A))
+                    continue
+                nogood = nogoods.violated(var, value, A)
+                if nogood is not None:
+                    stats.nogood_prunes += 1
+                    conflict.update(x for x, _ in nogood if x != var)
+                    continue
+
+                A[var] = value
+                stats.nodes += 1
+                buckets.assign(var, A)
+                result = backtrack(A)
+                if result is A or result is _RESTART:
+                    return result
+                del A[var]
+                buckets.unassign(var)
+
+                if backjump and var not in result:
+                    # var had nothing to do with the failure below: skip past it
+                    stats.backjumps += 1
+                    return result
+                conflict.update(result)
+                conflict.discard(var)
+
+            # dead end: these assignments rule out every value of var
+            stats.backtracks += 1
+            if nogoods.learn(frozenset((x, A[x]) for x in conflict)):
+                stats.nogoods_learned += 1
+            failures += 1
+            if cutoff is not None and failures >= cutoff:
+                return _RESTART
+            return conflict
+
+        result = backtrack(assignment)
+        if result is _RESTART:
+            stats.restarts += 1
+            run += 1
+            continue
+        if result is assignment:
+            return assignment
+        return None  # conflict set at the root: no solution
@@ -0,0 +1,243 @@
+"""
+dlx.py
+Knuth's Algorithm X for exact cover, using Dancing Links.
+
+An exact-cover instance is a set of columns (constraints) and a set of rows
+(candidates); each row covers some columns. A solution is a set of rows that
+covers every column exactly once.
+
+All links live in flat integer lists indexed by node id (no per-node objects):
+
+- node 0 is the root header
+- nodes 1..n_columns are the column headers (column k is node k + 1)
+- every later node is one 1 in the matrix
+
+L/R link nodes horizontally (headers among themselves, nodes within a row),
+U/D link nodes vertically within a column, C maps a node to its column header
+and ROW maps a node to the caller's row id.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import random
+from typing import List, Optional, Sequence
+
+
+@dataclass
+class DLXStats:
+    nodes: int = 0          # rows tried during the search
+    solutions: int = 0      # solutions found (up to the limit)
+
+
+class ExactCover:
+    def __init__(self, n_columns: int, rows: Sequence[Sequence[int]] = ()):
+        n = n_columns + 1
+        self.n_columns = n_columns
+        self.L: List[int] = [i - 1 for i in range(n)]
+        self.R: List[int] = [i + 1 for i in range(n)]
+        self.L[0] = n_columns
+        self.R[n_columns] = 0
+        self.U: List[int] = list(range(n))
+        self.D: List[int] = list(range(n))
+        self.C: List[int] = list(range(n))
+        self.ROW: List[int] = [-1] * n
+        self.S: List[int] = [0] * n           # live nodes per column header
+        self.row_head: List[int] = []         # first node of each row (-1 if empty)
+        self.selected: List[int] = []         # rows fixed up front via select_row()
+        for cols in rows:
+            self.add_row(cols)
+
+    def add_row(self, cols: Sequence[int]) -> int:
+        """
+        Append a row covering the given (0-based) columns; returns its row id.
+        """
+        L, R, U, D, C = self.L, self.R, self.U, self.D, self.C
+        row_id = len(self.row_head)
+        first = -1
+        for col in cols:
+            h = col + 1
+            x = len(U)
+            # vertical: insert above the header, i.e. at the bottom of the column
+            U.append(U[h])
+            D.append(h)
+            D[U[h]] = x
+            U[h] = x
+            C.append(h)
+            self.ROW.append(row_id)
+            self.S[h] += 1
+            # horizontal: insert to the left of the row's first node
+            if first == -1:
+                L.append(x)
+                R.append(x)
+                first = x
+            else:
+                L.append(L[first])
+                R.append(first)
+                R[L[first]] = x
+                L[first] = x
+        self.row_head.append(first)
+        return row_id
+
+    def copy(self) -> "ExactCover":
+        """
+        Independent copy of the current links (cheap: a few flat list copies).
+        Build a matrix once, then copy it per instance instead of rebuilding.
+        """
+        other = ExactCover.__new__(ExactCover)
+        other.n_columns = self.n_columns
+        other.L = self.L[:]
+        other.R = self.R[:]
+        other.U = self.U[:]
+        other.D = self.D[:]
+        other.C = self.C
+        other.ROW = self.ROW
+        other.S = self.S[:]
+        other.row_head = self.row_head
+        other.selected = self.selected[:]
+        return other
+
+    # ---------- cover / uncover ----------
+    def _cover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        R[L[c]] = R[c]
+        L[R[c]] = L[c]
+        i = D[c]
+        while i != c:
+            j = R[i]
+            while j != i:
+                U[D[j]] = U[j]
+                D[U[j]] = D[j]
+                S[C[j]] -= 1
+                j = R[j]
+            i = D[i]
+
+    def _uncover(self, c: int) -> None:
+        L, R, U, D, C, S = self.L, self.R, self.U, self.D, self.C, self.S
+        i = U[c]
+        while i != c:
+            j = L[i]
+            while j != i:
+                S[C[j]] += 1
+                U[D[j]] = j
+                D[U[j]] = j
+                j = L[j]
+            i = U[i]
+        R[L[c]] = c
+        L[R[c]] = c
+
+    def select_row(self, row_id: int) -> bool:
+        """
+        Force a row into every solution (e.g., a Sudoku given) by covering its
+        columns before the search. Returns False if one of them is already
+        covered, which means the instance has no solution.
+        """
+        L, R, C = self.L, self.R, self.C
+        start = self.row_head[row_id]
+        if start == -1:
+            return True
+        j = start
+        while True:
+            c = C[j]
+            if R[L[c]] != c:
+                return False
+            j = R[j]
+            if j == start:
+                break
+        j = start
+        while True:
+            self._cover(C[j])
+            j = R[j]
+            if j == start:
+                break
+        self.selected.append(row_id)
+        return True
+
+    # ---------- Algorithm X ----------
+    def solve(self, limit: int = 1, stats: Optional[DLXStats] = None, rng: Optional[random.Random] = None) -> List[List[int]]:
+        """
+        Return up to `limit` solutions, each a list of row ids (including rows
+        fixed with select_row). limit=0 means find all solutions.
+        With an rng, the rows of each chosen column are tried in random order
+        (e.g. to draw a random solution).
+        """
+        solutions: List[List[int]] = []
+        self._search(limit, stats, rng, solutions)
+        return solutions
+
+    def count_solutions(self, limit: int = 2, stats: Optional[DLXStats] = None) -> int:
+        """
+        Count solutions, stopping as soon as `limit` have been seen (0 = no limit).
+        Solutions are only counted, not stored, so limit=0 does not grow memory.
+        """
+        return self._search(limit, stats, None, None)
+
+    def _search(
+        self,
+        limit: int,
+        stats: Optional[DLXStats],
+        rng: Optional[random.Random],
+        solutions: Optional[List[List[int]]],
+    ) -> int:
+        # Algorithm X; collects row-id lists into `solutions` unless it is None.
+        # Returns the number of solutions found.
+        if stats is None:
+            stats = DLXStats()
+        L, R, D, C, S, ROW = self.L, self.R, self.D, self.C, self.S, self.ROW
+        keep = solutions is not None
+        partial: List[int] = list(self.selected)
+        found = 0
+
+        def search() -> bool:
+            # returns True once the limit is reached
+            nonlocal found
+            if R[0] == 0:
+                if keep:
+                    solutions.append(list(partial))
+                found += 1
+                stats.solutions += 1
+                return limit > 0 and found >= limit
+
+            # choose the column with the fewest remaining rows (Knuth's S heuristic)
+            c = R[0]
+            best = S[c]
+            j = R[c]
+            while j != 0 and best > 1:
+                if S[j] < best:
+                    c = j
+                    best = S[j]
+                j = R[j]
+            if best == 0:
+                return False
+
+            self._cover(c)
+            # column c's own vertical list is untouched by covering it
+            rows: List[int] = []
+            r = D[c]
+            while r != c:
+                rows.append(r)
+                r = D[r]
+            if rng is not None:
+                rng.shuffle(rows)
+            done = False
+            for r in rows:
+                stats.nodes += 1
+                if keep:
+                    partial.append(ROW[r])
+                j = R[r]
+                while j != r:
+                    self._cover(C[j])
+                    j = R[j]
+                done = search()
+                j = L[r]
+                while j != r:
+                    self._uncover(C[j])
+                    j = L[j]
+                if keep:
+                    partial.pop()
+                if done:
+                    break
+            self._uncover(c)
+            return done
+
+        search()
+        return found
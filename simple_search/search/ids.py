@@ -1,6 +1,10 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Any, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import time
+
+from simple_search.search.checkpoint import Checkpointer, CheckpointStats
+from simple_search.search.resources import ResourceMeter, ResourceUsage
 
 @dataclass
 class _Node:
@@ -15,74 +19,149 @@ class IDSStats:
     nodes_generated: int = 0
     nodes_expanded: int = 0
     max_frontier_size: int = 0
+    max_explored_size: int = 0    # deepest path held through parent links
     solution_depth: Optional[int] = None
     solution_cost: Optional[float] = None
+    runtime_ns: int = 0
+    resources: Optional[ResourceUsage] = None  # set when track_memory=True
+    checkpoints: Optional[CheckpointStats] = None  # set when a Checkpointer is used
 
 
-def depth_limited_search(problem, limit: Optional[int] = 5, return_stats: bool = False):
-    stats = IDSStats()
-    start = problem.start
-    stack: List[_Node] = [_Node(start, None, None, 0)]
-    stats.nodes_generated = 1
-    stats.max_frontier_size = max(stats.max_frontier_size, len(stack))
-
-    while stack:
-        node = stack.pop()
-        depth = node.depth
-        stats.nodes_expanded += 1
-        if problem.GoalTest(node.state):
-            path: List[Tuple[Any, Optional[str]]] = []
-            cur: Optional[_Node] = node
-            cost = 0.0
-            while cur is not None:
-                path.append((cur.state, cur.action))
-                if cur.parent is not None:
-                    try:
-                        cost += problem.Cost(cur.parent.state, cur.action, cur.state)
-                    except Exception:
-                        cost += 1.0
-                cur = cur.parent
-            path.reverse()
-            stats.solution_depth = len(path) - 1
-            stats.solution_cost = cost
-            if return_stats:
-                return (path, stats)
-            return path
-
-        if depth >= (limit or 0):
-            continue
-
-        children: List[_Node] = []
-        for action in problem.Actions(node.state):
-            child_state = problem.Transition(node.state, action)
-            stats.nodes_generated += 1
-            if hasattr(child_state, "is_valid") and not child_state.is_valid():
-                continue
-            child = _Node(child_state, action, node, node.depth + 1)
-            children.append(child)
-        for child in reversed(children):
-            stack.append(child)
+def depth_limited_search(
+    problem,
+    limit: Optional[int] = 5,
+    return_stats: bool = False,
+    track_memory: bool = False,
+    checkpointer: Optional[Checkpointer] = None,
+    resume: Optional[Dict[str, Any]] = None,
+    _outer: Optional[Callable[[], Dict[str, Any]]] = None,
+):
+    """
+    checkpointer: periodically save the limit and the DFS stack.
+    resume: a load_checkpoint(path, "dls") result to continue from.
+    """
+    start_ns = time.perf_counter_ns()
+    meter = ResourceMeter(track_memory).start()
+    try:
+        stats = IDSStats()
+        start = problem.start
+        stack: List[_Node] = [_Node(start, None, None, 0)]
+        stats.nodes_generated = 1
         stats.max_frontier_size = max(stats.max_frontier_size, len(stack))
+        if resume is not None:
+            limit, stack, stats = resume["limit"], resume["stack"], resume["stats"]
+        if checkpointer is not None:
+            stats.checkpoints = checkpointer.stats
+
+        def finish() -> None:
+            stats.runtime_ns = time.perf_counter_ns() - start_ns
+            stats.resources = meter.stop(stats.max_frontier_size + stats.max_explored_size)
+
+        while stack:
+            if checkpointer is not None and checkpointer.due():
+                # ids() adds its own progress so the whole run can be resumed
+                state = {"limit": limit, "stack": stack, "stats": stats}
+                if _outer is not None:
+                    state.update(_outer())
+                checkpointer.save("dls" if _outer is None else "ids", state)
+
+            node = stack.pop()
+            depth = node.depth
+            stats.nodes_expanded += 1
+            stats.max_explored_size = max(stats.max_explored_size, depth + 1)
+            if problem.GoalTest(node.state):
+                path: List[Tuple[Any, Optional[str]]] = []
+                cur: Optional[_Node] = node
+                cost = 0.0
+                while cur is not None:
+                    path.append((cur.state, cur.action))
+                    if cur.parent is not None:
+                        try:
+                            cost += problem.Cost(cur.parent.state, cur.action, cur.state)
+                        except Exception:
+                            cost += 1.0
+                    cur = cur.parent
+                path.reverse()
+                stats.solution_depth = len(path) - 1
+                stats.solution_cost = cost
+                finish()
+                if return_stats:
+                    return (path, stats)
+                return path
+
+            if depth >= (limit or 0):
+                continue
+
+            children: List[_Node] = []
+            for action in problem.Actions(node.state):
+                child_state = problem.Transition(node.state, action)
+                stats.nodes_generated += 1
+                if hasattr(child_state, "is_valid") and not child_state.is_valid():
+                    continue
+                child = _Node(child_state, action, node, node.depth + 1)
+                children.append(child)
+            for child in reversed(children):
+                stack.append(child)
+            stats.max_frontier_size = max(stats.max_frontier_size, len(stack))
+
+        finish()
+        if return_stats:
+            return ([], stats)
+        return []
+    finally:
+        meter.stop()  # no-op unless the search raised
+
+
+def ids(
+    problem,
+    max_limit: Optional[int] = 50,
+    return_stats: bool = False,
+    track_memory: bool = False,
+    checkpointer: Optional[Checkpointer] = None,
+    resume: Optional[Dict[str, Any]] = None,
+):
+    """
+    checkpointer: periodically save the current limit, its DFS stack and the
+    totals so far. resume: a load_checkpoint(path, "ids") result; the search
+    picks up inside the iteration it was saved in.
+    """
+    start_ns = time.perf_counter_ns()
+    meter = ResourceMeter(track_memory).start()
+    try:
+        accumulated = IDSStats()
+        first_limit = 0
+        if resume is not None:
+            accumulated = resume["accumulated"]
+            first_limit = resume["limit"]
+        if checkpointer is not None:
+            accumulated.checkpoints = checkpointer.stats
+
+        def finish() -> None:
+            accumulated.runtime_ns = time.perf_counter_ns() - start_ns
+            accumulated.resources = meter.stop(accumulated.max_frontier_size + accumulated.max_explored_size)
+
+        def outer() -> Dict[str, Any]:
+            return {"accumulated": accumulated}
 
-    if return_stats:
-        return ([], stats)
-    return []
-
-
-def ids(problem, max_limit: Optional[int] = 50, return_stats: bool = False):
-    accumulated = IDSStats()
-    for depth in range(0, max_limit + 1):
-        res = depth_limited_search(problem, limit=depth, return_stats=True)
-        path, stats = res
-        accumulated.nodes_generated += stats.nodes_generated
-        accumulated.nodes_expanded += stats.nodes_expanded
-        accumulated.max_frontier_size = max(accumulated.max_frontier_size, stats.max_frontier_size)
-        if path:
-            accumulated.solution_depth = stats.solution_depth
-            accumulated.solution_cost = stats.solution_cost
-            if return_stats:
-                return (path, accumulated)
-            return path
-    if return_stats:
-        return ([], accumulated)
-    return []
+        for depth in range(first_limit, max_limit + 1):
+            dls_resume = resume if resume is not None and depth == first_limit else None
+            res = depth_limited_search(problem, limit=depth, return_stats=True,
+                                       checkpointer=checkpointer, resume=dls_resume, _outer=outer)
+            path, stats = res
+            accumulated.nodes_generated += stats.nodes_generated
+            accumulated.nodes_expanded += stats.nodes_expanded
+            accumulated.max_frontier_size = max(accumulated.max_frontier_size, stats.max_frontier_size)
+            accumulated.max_explored_size = max(accumulated.max_explored_size, stats.max_explored_size)
+            if path:
+                accumulated.solution_depth = stats.solution_depth
+                accumulated.solution_cost = stats.solution_cost
+                finish()
+                if return_stats:
+                    return (path, accumulated)
+                return path
+        finish()
+        if return_stats:
+            return ([], accumulated)
+        return []
+    finally:
+        meter.stop()  # no-op unless the search raised
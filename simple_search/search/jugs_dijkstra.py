@@ -0,0 +1,197 @@
+"""
+jugs_dijkstra.py
+Fast path for WaterJugsProblem: cheapest-pour search over packed states.
+
+A state's volumes are packed into one mixed-radix integer
+    index = v0 + (c0 + 1) * (v1 + (c1 + 1) * (v2 + ...))
+so visited/distance/parent bookkeeping lives in flat arrays sized by the
+product of (capacity + 1), and no state objects are built during the search.
+
+Costs follow WaterJugsProblem.Cost (fill/empty = 1, pour = volume poured);
+they are small integers, so Dijkstra runs on a bucket queue (Dial's
+algorithm) with max-cost + 1 circular buckets instead of a binary heap.
+"""
+
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+import time
+
+from simple_search.problems.water_jugs import EMPTY, FILL, POUR, WaterJugsState
+from simple_search.search.resources import ResourceMeter, ResourceUsage
+
+DEFAULT_MAX_STATES = 50_000_000
+
+
+@dataclass
+class JugsStats:
+    nodes_generated: int = 0
+    nodes_expanded: int = 0
+    max_frontier_size: int = 0
+    max_closed_size: int = 0            # settled states
+    n_states: int = 0                   # size of the packed state space
+    solution_depth: Optional[int] = None
+    solution_cost: Optional[float] = None
+    runtime_ns: int = 0
+    runtime_ms: float = 0.0
+    distances: Optional[array] = None   # cost from start per index (-1 = unreached), full runs only
+    resources: Optional[ResourceUsage] = None  # set when track_memory=True
+
+
+def _strides(capacities: Tuple[int, ...]) -> List[int]:
+    strides: List[int] = []
+    stride = 1
+    for c in capacities:
+        strides.append(stride)
+        stride *= c + 1
+    return strides
+
+
+def encode_volumes(volumes: Tuple[int, ...], capacities: Tuple[int, ...]) -> int:
+    index = 0
+    for v, stride in zip(volumes, _strides(capacities)):
+        index += v * stride
+    return index
+
+
+def decode_volumes(index: int, capacities: Tuple[int, ...]) -> Tuple[int, ...]:
+    vols: List[int] = []
+    for c in capacities:
+        index, v = divmod(index, c + 1)
+        vols.append(v)
+    return tuple(vols)
+
+
+def decode_action(action_id: int, n: int) -> Tuple:
+    """
+    Action ids: fill i -> i, empty i -> n + i, pour i->j -> 2n + i * n + j.
+    """
+    if action_id < n:
+        return (FILL, action_id)
+    if action_id < 2 * n:
+        return (EMPTY, action_id - n)
+    i, j = divmod(action_id - 2 * n, n)
+    return (POUR, i, j)
+
+
+def jugs_dijkstra(
+    problem,
+    stop_at_target: bool = True,
+    return_stats: bool = False,
+    max_states: int = DEFAULT_MAX_STATES,
+    track_memory: bool = False,
+):
+    """
+    Cheapest plan (by volume poured) to get `problem.target` into some jug.
+
+    stop_at_target=True stops as soon as the first goal state is settled (it is
+    then already optimal); False settles the whole reachable space and keeps
+    the distance table in stats.distances.
+
+    Returns the path as [(WaterJugsState, action), ...] like bfs(), or
+    (path, JugsStats) with return_stats=True. Empty path if unreachable.
+    """
+    start_ns = time.perf_counter_ns()
+    caps = tuple(problem.capacities)
+    n = len(caps)
+    target = problem.target
+    strides = _strides(caps)
+    n_states = strides[-1] * (caps[-1] + 1) if n else 1
+    if n_states > max_states:
+        raise ValueError(f"State space too large for flat arrays: {n_states} > {max_states}")
+    if not problem.start.is_valid(caps):
+        raise ValueError(f"Start volumes out of range: {problem.start.volumes}")
+    meter = ResourceMeter(track_memory).start()
+    try:
+
+        stats = JugsStats(n_states=n_states)
+        dist = array("q", [-1]) * n_states
+        parent = array("i", [-1]) * n_states   # max_states keeps indices in int32
+        parent_action = array("i", [-1]) * n_states
+        settled = bytearray(n_states)
+
+        # Dial's bucket queue: every edge costs 1..max_cost, so only max_cost + 1
+        # distinct distances can be pending at once.
+        max_cost = max(max(caps, default=1), 1)
+        n_buckets = max_cost + 1
+        buckets: List[List[int]] = [[] for _ in range(n_buckets)]
+
+        source = encode_volumes(problem.start.volumes, caps)
+        dist[source] = 0
+        buckets[0].append(source)
+        pending = 1
+        d = 0
+        goal = -1
+        vols = [0] * n
+
+        while pending:
+            bucket = buckets[d % n_buckets]
+            if not bucket:
+                d += 1
+                continue
+            u = bucket.pop()
+            pending -= 1
+            if settled[u] or dist[u] != d:
+                continue  # stale entry
+            settled[u] = 1
+            stats.nodes_expanded += 1
+
+            rest = u
+            for k in range(n):
+                rest, vols[k] = divmod(rest, caps[k] + 1)
+
+            if goal == -1 and target in vols:
+                goal = u
+                if stop_at_target:
+                    break
+
+            children: List[Tuple[int, int, int]] = []  # (index, action id, cost)
+            for i in range(n):
+                vi = vols[i]
+                si = strides[i]
+                if vi < caps[i]:
+                    children.append((u + (caps[i] - vi) * si, i, 1))
+                if vi > 0:
+                    children.append((u - vi * si, n + i, 1))
+                    for j in range(n):
+                        if j == i or vols[j] >= caps[j]:
+                            continue
+                        t = min(vi, caps[j] - vols[j])
+                        children.append((u - t * si + t * strides[j], 2 * n + i * n + j, t))
+            for w, action_id, cost in children:
+                stats.nodes_generated += 1
+                if settled[w]:
+                    continue
+                dw = d + cost
+                if dist[w] == -1 or dw < dist[w]:
+                    dist[w] = dw
+                    parent[w] = u
+                    parent_action[w] = action_id
+                    buckets[dw % n_buckets].append(w)
+                    pending += 1
+            stats.max_frontier_size = max(stats.max_frontier_size, pending)
+
+        path: List[Tuple[Any, Optional[Tuple]]] = []
+        if goal != -1:
+            cur = goal
+            while cur != -1:
+                a = parent_action[cur]
+                path.append((WaterJugsState(decode_volumes(cur, caps)), decode_action(a, n) if a != -1 else None))
+                cur = parent[cur]
+            path.reverse()
+            stats.solution_depth = len(path) - 1
+            stats.solution_cost = float(dist[goal])
+        if not stop_at_target:
+            stats.distances = dist
+        stats.max_closed_size = stats.nodes_expanded
+        stats.runtime_ns = time.perf_counter_ns() - start_ns
+        stats.runtime_ms = stats.runtime_ns / 1e6
+        # the flat arrays hold every packed state, so count them all as stored
+        stats.resources = meter.stop(n_states)
+
+        if return_stats:
+            return (path, stats)
+        return path
+    finally:
+        meter.stop()  # no-op unless the search raised
@@ -0,0 +1,168 @@
+"""
+lrta.py
+Real-time heuristic search (LRTA* / RTAA*-style) with bounded per-move work.
+
+Instead of planning the whole path up front like astar(), each move runs a
+small A* lookahead from the current state (at most `lookahead` expansions, and
+optionally at most `time_budget_ms`), then:
+
+- learns: every state expanded in the lookahead gets
+      h(x) = f(best frontier state) - g(x)
+  (the RTAA* update; with lookahead=1 this is the classic LRTA* rule
+  h(s) = min over children of cost + h(child))
+- moves one step toward the best frontier state.
+
+Learned values live in LRTAStar.table and persist across trials, so repeated
+trials on the same instance with an admissible heuristic converge to an
+optimal path (a trial that learns nothing has followed one).
+
+Uses the same successors(s) -> (s2, action, cost) and h(s) interfaces as
+astar(); h may also be a name from the HEURISTICS registry ('h0', 'h1', 'h2').
+"""
+
+from __future__ import annotations
+import heapq
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import time
+
+from simple_search.heuristics import HEURISTICS
+
+
+class LRTAResult:
+    def __init__(self):
+        self.path: Optional[List[Tuple[Any, Any]]] = None
+        self.cost: float = 0.0
+        self.solved: bool = False
+        self.steps: int = 0
+        self.nodes_expanded: int = 0
+        self.h_updates: int = 0              # learned-table entries raised this trial
+        self.step_times_ns: List[int] = []   # wall time of each move decision
+        self.max_step_ms: float = 0.0
+        self.runtime_ms: float = 0.0
+        self.heuristic_name: str = ""
+
+
+class LRTAStar:
+    def __init__(
+        self,
+        goal_test: Callable,
+        successors: Callable,
+        h: Union[str, Callable] = "h1",
+        lookahead: int = 1,
+        time_budget_ms: Optional[float] = None,
+        heuristic_name: Optional[str] = None,
+    ):
+        if isinstance(h, str):
+            if h not in HEURISTICS:
+                raise ValueError(f"Unknown heuristic: {h}")
+            heuristic_name = heuristic_name or f"LRTA* ({h})"
+            h = HEURISTICS[h]
+        if lookahead < 1:
+            raise ValueError("lookahead must be at least 1")
+        self.goal_test = goal_test
+        self.successors = successors
+        self.h = h
+        self.lookahead = lookahead
+        self.time_budget_ns = None if time_budget_ms is None else int(time_budget_ms * 1e6)
+        self.heuristic_name = heuristic_name or "LRTA*"
+        self.table: Dict[Any, float] = {}  # learned h values, kept across trials
+
+    def h_value(self, s: Any) -> float:
+        v = self.table.get(s)
+        return self.h(s) if v is None else v
+
+    def step(self, s: Any, result: LRTAResult) -> Optional[Tuple[Any, Any, float]]:
+        """
+        Bounded lookahead from s, learn, and return the move (s2, action, cost)
+        to take, or None if s is a dead end.
+        """
+        deadline = None if self.time_budget_ns is None else time.perf_counter_ns() + self.time_budget_ns
+        g: Dict[Any, float] = {s: 0.0}
+        parent: Dict[Any, Tuple[Any, Any, float]] = {}
+        frontier = [(self.h_value(s), 0.0, 0, s)]
+        counter = 1
+        closed: List[Any] = []
+        closed_set = set()
+        target = None
+        target_f = 0.0
+
+        while frontier:
+            f, gx, _, x = frontier[0]
+            if gx > g[x] or x in closed_set:
+                heapq.heappop(frontier)
+                continue
+            if x != s and self.goal_test(x):
+                target, target_f = x, gx
+                break
+            if closed and (len(closed) >= self.lookahead or (deadline is not None and time.perf_counter_ns() >= deadline)):
+                target, target_f = x, f
+                break
+            heapq.heappop(frontier)
+            closed.append(x)
+            closed_set.add(x)
+            result.nodes_expanded += 1
+            for x2, action, cost in self.successors(x):
+                g2 = gx + cost
+                if x2 not in g or g2 < g[x2]:
+                    g[x2] = g2
+                    parent[x2] = (x, action, cost)
+                    heapq.heappush(frontier, (g2 + self.h_value(x2), g2, counter, x2))
+                    counter += 1
+
+        if target is None:
+            # nothing reachable beyond the lookahead: mark the expanded states as dead
+            for x in closed:
+                self.table[x] = float("inf")
+            return None
+
+        # RTAA* learning: h(x) = f(target) - g(x) for every expanded state
+        for x in closed:
+            new_h = target_f - g[x]
+            if new_h > self.h_value(x):
+                self.table[x] = new_h
+                result.h_updates += 1
+
+        # walk back from the target to the first move out of s
+        cur = target
+        while parent[cur][0] != s:
+            cur = parent[cur][0]
+        _, action, cost = parent[cur]
+        return cur, action, cost
+
+    def trial(self, start: Any, max_steps: int = 100000) -> LRTAResult:
+        """
+        Act from `start` until a goal, a dead end, or max_steps moves.
+        """
+        start_ns = time.perf_counter_ns()
+        result = LRTAResult()
+        result.heuristic_name = self.heuristic_name
+        path: List[Tuple[Any, Any]] = [(start, None)]
+        s = start
+        while not self.goal_test(s) and result.steps < max_steps:
+            t0 = time.perf_counter_ns()
+            move = self.step(s, result)
+            result.step_times_ns.append(time.perf_counter_ns() - t0)
+            if move is None:
+                break
+            s, action, cost = move
+            path.append((s, action))
+            result.cost += cost
+            result.steps += 1
+        result.solved = self.goal_test(s)
+        result.path = path
+        if result.step_times_ns:
+            result.max_step_ms = max(result.step_times_ns) / 1e6
+        result.runtime_ms = (time.perf_counter_ns() - start_ns) / 1e6
+        return result
+
+    def solve(self, start: Any, max_trials: int = 1000, max_steps: int = 100000) -> Tuple[LRTAResult, int]:
+        """
+        Repeat trials until one learns nothing (converged) or max_trials.
+        Returns (last trial's result, number of trials run).
+        """
+        result = LRTAResult()
+        for n in range(1, max_trials + 1):
+            result = self.trial(start, max_steps)
+            if result.solved and result.h_updates == 0:
+                return result, n
+        return result, max_trials
@@ -0,0 +1,107 @@
+"""
+multi_query.py
+Many starts, one fixed goal: answer every query from a single backward search.
+
+ReverseDijkstra runs Dijkstra from the goal state(s) over the problem's
+Predecessors(s) -> [(s_prev, action, cost), ...] (the moves that lead *into*
+s). The search is lazy and kept between queries: a query for `start` only
+extends it until `start` is settled, and a start that is already settled is
+answered by walking next-hop pointers toward the goal, with no search at all.
+Over N queries the total work is at most one full backward search.
+
+    engine = ReverseDijkstra.from_problem(EightPuzzleProblem())
+    for start in starts:
+        result = engine.query(start)   # AStarResult, path as astar() returns
+
+Only valid with non-negative costs, like any Dijkstra.
+"""
+
+from __future__ import annotations
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import time
+
+from simple_search.search.astar import AStarResult
+
+
+class ReverseDijkstra:
+    def __init__(self, goals: Iterable[Any], predecessors: Callable[[Any], Iterable[Tuple[Any, Any, float]]]):
+        self.predecessors = predecessors
+        self.dist: Dict[Any, float] = {}
+        # state -> (next state toward the goal, forward action taking us there)
+        self.next_hop: Dict[Any, Tuple[Any, Any]] = {}
+        self.settled = set()
+        self.frontier: List[Tuple[float, int, Any]] = []
+        self.counter = 0
+        self.nodes_expanded = 0   # totals over all queries
+        self.nodes_generated = 0
+        self.queries = 0
+        for g in goals:
+            if g not in self.dist:
+                self.dist[g] = 0.0
+                self.frontier.append((0.0, self.counter, g))
+                self.counter += 1
+                self.nodes_generated += 1
+        heapq.heapify(self.frontier)
+
+    @classmethod
+    def from_problem(cls, problem) -> "ReverseDijkstra":
+        """
+        Use problem.GoalStates() and problem.Predecessors.
+        """
+        return cls(problem.GoalStates(), problem.Predecessors)
+
+    def _settle_until(self, target: Any, result: AStarResult) -> None:
+        frontier, dist = self.frontier, self.dist
+        while frontier and target not in self.settled:
+            result.max_frontier_size = max(result.max_frontier_size, len(frontier))
+            d, _, s = heapq.heappop(frontier)
+            if s in self.settled or d > dist[s]:
+                result.stale_pops += 1
+                continue
+            self.settled.add(s)
+            result.nodes_expanded += 1
+            for s_prev, action, cost in self.predecessors(s):
+                result.nodes_generated += 1
+                d2 = d + cost
+                if s_prev not in dist or d2 < dist[s_prev]:
+                    dist[s_prev] = d2
+                    self.next_hop[s_prev] = (s, action)
+                    heapq.heappush(frontier, (d2, self.counter, s_prev))
+                    self.counter += 1
+        self.nodes_expanded += result.nodes_expanded
+        self.nodes_generated += result.nodes_generated
+
+    def query(self, start: Any) -> AStarResult:
+        """
+        Cheapest path from `start` to a goal, as [(state, action), ...] with
+        the same layout as astar(). result.nodes_expanded counts only the
+        states this query had to settle (0 if the tree already reached start);
+        result.path stays None if no goal is reachable.
+        """
+        start_ns = time.perf_counter_ns()
+        result = AStarResult()
+        result.heuristic_name = "Reverse Dijkstra"
+        self.queries += 1
+        self._settle_until(start, result)
+        if start in self.settled:
+            path: List[Tuple[Any, Any]] = [(start, None)]
+            cur = start
+            while cur in self.next_hop:
+                cur, action = self.next_hop[cur]
+                path.append((cur, action))
+            result.path = path
+            result.cost = self.dist[start]
+            result.solution_depth = len(path) - 1
+        result.max_closed_size = len(self.settled)
+        result.finish(start_ns)
+        return result
+
+    def distance(self, start: Any) -> Optional[float]:
+        """
+        Cost to the nearest goal, or None if unreachable.
+        """
+        result = AStarResult()
+        self.queries += 1
+        self._settle_until(start, result)
+        return self.dist[start] if start in self.settled else None
@@ -0,0 +1,182 @@
+"""
+portfolio.py
+Portfolio CSP solving: run several differently configured backtracking_search
+solvers on the same instance in separate processes, take the first answer,
+and terminate the rest.
+
+No single configuration wins everywhere (MRV ties, value order, backjumping
+and restarts each pay off on different instances), so on a multi-core machine
+a portfolio's time is close to the best configuration's instead of the worst.
+
+Closures (legal_values_fn etc.) can't be sent to another process, so each
+process builds the problem itself from a picklable builder and its arguments:
+
+    result = portfolio_search(sudoku_csp, (rows,))
+    print(result.winner.name, result.runtime_ms)
+    print_grid(result.solution)
+
+Every configuration is a complete search, so the first one to finish decides
+the instance: result.solution is None only if it proved there is no solution.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+import multiprocessing
+import os
+import queue
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from simple_search.search.csp import GEOMETRIC, LCV, LUBY, SIMPLE, Assignment, CSPStats, backtracking_search
+
+
+@dataclass
+class SolverConfig:
+    name: str
+    value_order: str = SIMPLE
+    use_graph: bool = True        # incremental MRV on the constraint graph; False = rescan MRV
+    backjump: bool = False
+    max_nogoods: int = 0
+    restarts: Optional[str] = None
+    restart_base: int = 100
+    seed: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)  # any other backtracking_search kwargs
+
+    def search_kwargs(self, problem: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        backtracking_search keyword arguments for this configuration on `problem`
+        (the dict a builder such as sudoku_csp returns).
+        """
+        kwargs = dict(problem)
+        if not self.use_graph:
+            kwargs.pop("neighbors", None)
+        kwargs.update(
+            value_order=self.value_order,
+            backjump=self.backjump,
+            max_nogoods=self.max_nogoods,
+            restarts=self.restarts,
+            restart_base=self.restart_base,
+            seed=self.seed,
+        )
+        kwargs.update(self.extra)
+        return kwargs
+
+
+DEFAULT_PORTFOLIO: List[SolverConfig] = [
+    SolverConfig("mrv"),
+    SolverConfig("mrv+lcv", value_order=LCV),
+    SolverConfig("cbj+nogoods", backjump=True, max_nogoods=1000),
+    SolverConfig("luby seed=1", backjump=True, max_nogoods=1000, restarts=LUBY, seed=1),
+    SolverConfig("geometric seed=2", value_order=LCV, restarts=GEOMETRIC, seed=2),
+    SolverConfig("luby seed=3", restarts=LUBY, restart_base=50, seed=3),
+    SolverConfig("rescan mrv", use_graph=False),
+    SolverConfig("luby+lcv seed=4", value_order=LCV, backjump=True, restarts=LUBY, seed=4),
+]
+
+
+class PortfolioResult:
+    def __init__(self):
+        self.solution: Optional[Assignment] = None
+        self.winner: Optional[SolverConfig] = None
+        self.stats: Optional[CSPStats] = None   # the winner's stats
+        self.configs_run: int = 0
+        self.runtime_ns: int = 0
+        self.runtime_ms: float = 0.0
+
+
+def _run_config(
+    index: int,
+    config: SolverConfig,
+    builder: Callable[..., Dict[str, Any]],
+    args: Tuple,
+    results: "multiprocessing.Queue",
+) -> None:
+    # child process: build the instance, solve, report (index, solution, stats, error)
+    try:
+        stats = CSPStats()
+        solution = backtracking_search(**config.search_kwargs(builder(*args)), stats=stats)
+        results.put((index, solution, stats, None))
+    except Exception as exc:  # report instead of leaving the parent waiting
+        results.put((index, None, None, f"{type(exc).__name__}: {exc}"))
+
+
+def portfolio_search(
+    builder: Callable[..., Dict[str, Any]],
+    args: Sequence[Any] = (),
+    configs: Optional[Sequence[SolverConfig]] = None,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+) -> PortfolioResult:
+    """
+    Run up to `workers` configurations (default: one per CPU) on builder(*args)
+    and return the first finisher's answer in a PortfolioResult; the other
+    processes are terminated. builder must be a picklable (module-level)
+    function returning backtracking_search keyword arguments.
+
+    Only the first `workers` configurations run, so workers=1 (also the
+    default on a 1-CPU machine) is not a portfolio: it runs configs[0] alone,
+    in this process unless a timeout is set. Check result.configs_run.
+    timeout (seconds): give up and return with winner=None; the search then
+    always runs in a subprocess so it can be stopped.
+    Raises ValueError if every configuration failed with an error.
+    """
+    if configs is None:
+        configs = DEFAULT_PORTFOLIO
+    if not configs:
+        raise ValueError("Portfolio needs at least one configuration")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    start_ns = time.perf_counter_ns()
+    result = PortfolioResult()
+    chosen = list(configs[:max(workers, 1)])
+    result.configs_run = len(chosen)
+
+    if len(chosen) == 1 and timeout is None:
+        stats = CSPStats()
+        result.solution = backtracking_search(**chosen[0].search_kwargs(builder(*args)), stats=stats)
+        result.winner, result.stats = chosen[0], stats
+        return _finish(result, start_ns)
+
+    results: "multiprocessing.Queue" = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=_run_config, args=(i, cfg, builder, tuple(args), results), daemon=True)
+        for i, cfg in enumerate(chosen)
+    ]
+    for p in procs:
+        p.start()
+    deadline = None if timeout is None else time.monotonic() + timeout
+    errors: List[str] = []
+    try:
+        while len(errors) < len(procs):
+            wait = 0.05 if deadline is None else min(0.05, deadline - time.monotonic())
+            if wait <= 0:
+                break  # timed out
+            try:
+                index, solution, stats, error = results.get(timeout=wait)
+            except queue.Empty:
+                if not any(p.is_alive() for p in procs) and results.empty():
+                    break  # every process died without reporting
+                continue
+            if error is not None:
+                errors.append(f"{chosen[index].name}: {error}")
+                continue
+            result.solution, result.winner, result.stats = solution, chosen[index], stats
+            break
+    finally:
+        # cancel the rest
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+        for p in procs:
+            p.join()
+        results.close()
+
+    if result.winner is None and errors and len(errors) == len(procs):
+        raise ValueError("Every portfolio configuration failed: " + "; ".join(errors))
+    return _finish(result, start_ns)
+
+
+def _finish(result: PortfolioResult, start_ns: int) -> PortfolioResult:
+    result.runtime_ns = time.perf_counter_ns() - start_ns
+    result.runtime_ms = result.runtime_ns / 1e6
+    return result
@@ -0,0 +1,109 @@
+"""
+resources.py
+Optional memory accounting for the search engines (track_memory=True).
+
+ResourceMeter wraps a search and reports:
+- peak_traced_bytes: tracemalloc peak of Python allocations during the search
+- retained_blocks: blocks allocated during the search and still alive at the end (sys.getallocatedblocks delta)
+- peak_rss_kb: process peak resident set size (0 where the resource module is missing)
+- bytes_per_node: peak_traced_bytes / nodes stored at peak (frontier + closed)
+
+tracemalloc slows a search down noticeably, so it is only on when asked for.
+
+Meters may nest (e.g. timing a batch of astar(track_memory=True) calls): an
+inner meter resets tracemalloc's peak, so it first hands the peak so far to
+the enclosing meter. Other code reading tracemalloc's peak around a meter
+will see it reset.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass
+import sys
+import tracemalloc
+from typing import List
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+@dataclass
+class ResourceUsage:
+    peak_traced_bytes: int = 0
+    retained_blocks: int = 0
+    peak_rss_kb: int = 0
+    bytes_per_node: float = 0.0
+
+
+def peak_rss_kb() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# running meters, innermost last
+_ACTIVE: List["ResourceMeter"] = []
+
+
+class ResourceMeter:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._own_tracing = False
+        self._base_traced = 0
+        self._base_blocks = 0
+        self._peak_floor = 0  # peak seen before an inner meter reset it
+        self._running = False
+        self.usage = None     # what stop() returned
+
+    def start(self) -> "ResourceMeter":
+        if not self.enabled:
+            return self
+        if tracemalloc.is_tracing():
+            # someone else is tracing: measure relative to where we are now
+            current, peak = tracemalloc.get_traced_memory()
+            if _ACTIVE:
+                outer = _ACTIVE[-1]
+                outer._peak_floor = max(outer._peak_floor, peak)
+            self._base_traced = current
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            self._own_tracing = True
+        self._base_blocks = sys.getallocatedblocks()
+        _ACTIVE.append(self)
+        self._running = True
+        return self
+
+    def stop(self, nodes_stored: int = 0):
+        """
+        Finish measuring; returns a ResourceUsage, or None if disabled.
+        nodes_stored is the peak number of search nodes held (frontier + closed).
+        Calling it again just returns the first result, so engines can also
+        call it from a `finally:` to stop tracing when a search raises.
+        """
+        if not self._running:
+            return self.usage
+        self._running = False
+        _, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, self._peak_floor)
+        blocks = sys.getallocatedblocks()
+        if self in _ACTIVE:
+            _ACTIVE.remove(self)
+        if _ACTIVE:
+            # our peak happened inside the enclosing meter too
+            outer = _ACTIVE[-1]
+            outer._peak_floor = max(outer._peak_floor, peak)
+        if self._own_tracing:
+            tracemalloc.stop()
+            self._own_tracing = False
+        usage = ResourceUsage()
+        usage.peak_traced_bytes = max(peak - self._base_traced, 0)
+        usage.retained_blocks = blocks - self._base_blocks
+        usage.peak_rss_kb = peak_rss_kb()
+        if nodes_stored > 0:
+            usage.bytes_per_node = usage.peak_traced_bytes / nodes_stored
+        self.usage = usage
+        return usage
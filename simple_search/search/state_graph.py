@@ -0,0 +1,324 @@
+"""
+state_graph.py
+Compile a small problem's state space once into CSR adjacency arrays, then run
+BFS / Dijkstra / A* directly on the arrays for many fast repeated queries.
+
+compile_problem() explores everything reachable from problem.start through the
+usual Actions / Transition / GoalTest / Cost protocol and gives each state a
+dense integer id (0 = start, in BFS order). Edges out of node u are the slots
+offsets[u] .. offsets[u + 1] - 1 of targets / costs / action_ids.
+
+save_graph() writes each array as a .npy file (plain stdlib writer, numpy is not
+required) plus a pickle with the state and action tables; load_graph() memory-maps
+the arrays back, and numpy users can np.load(..., mmap_mode="r") them as well.
+"""
+
+from __future__ import annotations
+import ast
+import heapq
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+import time
+
+from simple_search.search.astar import AStarResult
+from simple_search.search.resources import ResourceMeter
+
+ARRAY_NAMES = ("offsets", "targets", "costs", "action_ids", "goals")
+META_FILE = "meta.pkl"
+
+_ENDIAN = "<" if sys.byteorder == "little" else ">"
+_DESCR = {"q": _ENDIAN + "i8", "i": _ENDIAN + "i4", "d": _ENDIAN + "f8", "B": "|u1"}
+_TYPECODE = {v: k for k, v in _DESCR.items()}
+
+
+class CompiledGraph:
+    def __init__(
+        self,
+        offsets: Sequence[int],
+        targets: Sequence[int],
+        costs: Sequence[float],
+        action_ids: Sequence[int],
+        goals: Sequence[int],
+        states: Optional[List[Any]] = None,
+        actions: Optional[List[Any]] = None,
+    ):
+        self.offsets = offsets        # n_nodes + 1 entries
+        self.targets = targets        # n_edges entries, node ids
+        self.costs = costs            # n_edges entries
+        self.action_ids = action_ids  # n_edges entries, index into `actions`
+        self.goals = goals            # n_nodes entries, 1 = GoalTest was true
+        self.states = states          # node id -> state (None if not kept)
+        self.actions = actions        # action id -> action label
+        self.n_nodes = len(offsets) - 1
+        self.n_edges = len(targets)
+        self._index: Optional[Dict[Any, int]] = None
+
+    def node_id(self, state: Any) -> int:
+        """
+        Dense id of a state (KeyError if it was not reachable when compiled).
+        """
+        if self._index is None:
+            if self.states is None:
+                raise ValueError("Graph was compiled or loaded without its state table")
+            self._index = {s: i for i, s in enumerate(self.states)}
+        return self._index[state]
+
+    def heuristic_table(self, h: Callable[[Any], float]) -> array:
+        """
+        Evaluate a state heuristic once per node, for csr_astar.
+        """
+        if self.states is None:
+            raise ValueError("Graph was compiled or loaded without its state table")
+        return array("d", (h(s) for s in self.states))
+
+    def decode_path(self, path: List[Tuple[int, int]]) -> List[Tuple[Any, Any]]:
+        """
+        [(node id, action id), ...] -> [(state, action), ...] as astar() returns.
+        """
+        states, actions = self.states, self.actions
+        return [
+            (states[u] if states is not None else u,
+             (actions[a] if actions is not None else a) if a != -1 else None)
+            for u, a in path
+        ]
+
+
+# ---------- compile ----------
+def compile_problem(problem, keep_states: bool = True, max_states: Optional[int] = None) -> CompiledGraph:
+    """
+    Enumerate every state reachable from problem.start. Children that fail
+    is_valid() are dropped, as bfs() does.
+    """
+    start = problem.start
+    index: Dict[Any, int] = {start: 0}
+    states: List[Any] = [start]
+    action_index: Dict[Any, int] = {}
+    actions: List[Any] = []
+
+    offsets = array("q", [0])
+    targets = array("i")
+    costs = array("d")
+    action_ids = array("i")
+    goals = bytearray()
+
+    queue = deque([start])
+    while queue:
+        s = queue.popleft()
+        goals.append(1 if problem.GoalTest(s) else 0)
+        for a in problem.Actions(s):
+            s2 = problem.Transition(s, a)
+            if hasattr(s2, "is_valid") and not s2.is_valid():
+                continue
+            v = index.get(s2)
+            if v is None:
+                v = len(states)
+                if max_states is not None and v >= max_states:
+                    raise ValueError(f"State space exceeds max_states={max_states}")
+                index[s2] = v
+                states.append(s2)
+                queue.append(s2)
+            aid = action_index.get(a)
+            if aid is None:
+                aid = action_index[a] = len(actions)
+                actions.append(a)
+            targets.append(v)
+            costs.append(problem.Cost(s, a, s2))
+            action_ids.append(aid)
+        offsets.append(len(targets))
+
+    graph = CompiledGraph(offsets, targets, costs, action_ids, array("B", goals),
+                          states if keep_states else None, actions)
+    if keep_states:
+        graph._index = index
+    return graph
+
+
+# ---------- .npy save / memory-mapped load ----------
+def _write_npy(path: str, data: array) -> None:
+    header = "{'descr': '%s', 'fortran_order': False, 'shape': (%d,), }" % (_DESCR[data.typecode], len(data))
+    # magic (6) + version (2) + header length (2) + header, padded to 64 bytes
+    pad = 64 - (10 + len(header) + 1) % 64
+    header = header + " " * (pad % 64) + "\n"
+    with open(path, "wb") as f:
+        f.write(b"\x93NUMPY\x01\x00")
+        f.write(struct.pack("<H", len(header)))
+        f.write(header.encode("latin1"))
+        f.write(data.tobytes())
+
+
+def _read_npy(path: str, use_mmap: bool = True) -> Union[memoryview, array]:
+    with open(path, "rb") as f:
+        magic = f.read(8)
+        if magic[:6] != b"\x93NUMPY":
+            raise ValueError(f"Not a .npy file: {path}")
+        if magic[6] == 1:
+            (hlen,) = struct.unpack("<H", f.read(2))
+            start = 10 + hlen
+        else:
+            (hlen,) = struct.unpack("<I", f.read(4))
+            start = 12 + hlen
+        header = ast.literal_eval(f.read(hlen).decode("latin1"))
+        typecode = _TYPECODE.get(header["descr"])
+        if typecode is None or header["fortran_order"] or len(header["shape"]) != 1:
+            raise ValueError(f"Unsupported .npy layout in {path}: {header}")
+        if not use_mmap or header["shape"][0] == 0:
+            f.seek(start)
+            data = array(typecode)
+            data.frombytes(f.read())
+            return data
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    # the memoryview keeps the mapping alive after the file is closed
+    return memoryview(mm)[start:].cast(typecode)
+
+
+def save_graph(graph: CompiledGraph, directory: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for name in ARRAY_NAMES:
+        data = getattr(graph, name)
+        if not isinstance(data, array):
+            data = array(data.format, data)
+        _write_npy(os.path.join(directory, f"{name}.npy"), data)
+    with open(os.path.join(directory, META_FILE), "wb") as f:
+        pickle.dump({"states": graph.states, "actions": graph.actions}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_graph(directory: str, use_mmap: bool = True, load_states: bool = True) -> CompiledGraph:
+    arrays = {name: _read_npy(os.path.join(directory, f"{name}.npy"), use_mmap) for name in ARRAY_NAMES}
+    states = actions = None
+    meta_path = os.path.join(directory, META_FILE)
+    if os.path.exists(meta_path):
+        with open(meta_path, "rb") as f:
+            meta = pickle.load(f)
+        actions = meta["actions"]
+        if load_states:
+            states = meta["states"]
+    return CompiledGraph(states=states, actions=actions, **arrays)
+
+
+# ---------- searches on the arrays ----------
+def _finish(graph: CompiledGraph, result: AStarResult, goal: int, g: float,
+            parent: array, parent_action: array, start_ns: int, meter: ResourceMeter) -> AStarResult:
+    if goal != -1:
+        path: List[Tuple[int, int]] = []
+        cur = goal
+        while cur != -1:
+            path.append((cur, parent_action[cur]))
+            cur = parent[cur]
+        path.reverse()
+        result.path = path
+        result.cost = g
+        result.solution_depth = len(path) - 1
+    result.max_closed_size = result.nodes_expanded
+    result.finish(start_ns, meter)
+    return result
+
+
+def csr_bfs(graph: CompiledGraph, source: int = 0, track_memory: bool = False) -> AStarResult:
+    """
+    Fewest-edges path from `source` to any goal node. result.path holds
+    (node id, action id) pairs; see CompiledGraph.decode_path.
+    """
+    start_ns = time.perf_counter_ns()
+    meter = ResourceMeter(track_memory).start()
+    try:
+        result = AStarResult()
+        result.heuristic_name = "CSR BFS"
+        offsets, targets, costs, goals = graph.offsets, graph.targets, graph.costs, graph.goals
+        parent = array("i", [-1]) * graph.n_nodes
+        parent_action = array("i", [-1]) * graph.n_nodes
+        g_cost = array("d", [0.0]) * graph.n_nodes
+        seen = bytearray(graph.n_nodes)
+        seen[source] = 1
+        result.nodes_generated = 1
+        if goals[source]:
+            result.nodes_expanded = 1
+            return _finish(graph, result, source, 0.0, parent, parent_action, start_ns, meter)
+
+        queue = deque([source])
+        while queue:
+            result.max_frontier_size = max(result.max_frontier_size, len(queue))
+            u = queue.popleft()
+            result.nodes_expanded += 1
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                result.nodes_generated += 1
+                if seen[v]:
+                    continue
+                seen[v] = 1
+                parent[v] = u
+                parent_action[v] = graph.action_ids[e]
+                g_cost[v] = g_cost[u] + costs[e]
+                if goals[v]:
+                    return _finish(graph, result, v, g_cost[v], parent, parent_action, start_ns, meter)
+                queue.append(v)
+        return _finish(graph, result, -1, 0.0, parent, parent_action, start_ns, meter)
+    finally:
+        meter.stop()  # no-op unless the search raised
+
+
+def csr_astar(
+    graph: CompiledGraph,
+    h: Optional[Union[Sequence[float], Callable[[int], float]]] = None,
+    source: int = 0,
+    heuristic_name: str = "CSR A*",
+    track_memory: bool = False,
+) -> AStarResult:
+    """
+    A* over the compiled graph. `h` is a per-node table (see heuristic_table)
+    or a function of the node id; None gives Dijkstra.
+    """
+    start_ns = time.perf_counter_ns()
+    meter = ResourceMeter(track_memory).start()
+    try:
+        result = AStarResult()
+        result.heuristic_name = heuristic_name
+        if h is None:
+            h_of = lambda u: 0.0
+        elif callable(h):
+            h_of = h
+        else:
+            h_of = h.__getitem__
+        offsets, targets, costs, action_ids, goals = graph.offsets, graph.targets, graph.costs, graph.action_ids, graph.goals
+        n = graph.n_nodes
+        inf = float("inf")
+        best_g = array("d", [inf]) * n
+        parent = array("i", [-1]) * n
+        parent_action = array("i", [-1]) * n
+        closed = bytearray(n)
+
+        best_g[source] = 0.0
+        frontier = [(h_of(source), 0.0, source)]
+        result.nodes_generated = 1
+        while frontier:
+            result.max_frontier_size = max(result.max_frontier_size, len(frontier))
+            f, g, u = heapq.heappop(frontier)
+            if closed[u] or g > best_g[u]:
+                continue
+            closed[u] = 1
+            result.nodes_expanded += 1
+            if goals[u]:
+                return _finish(graph, result, u, g, parent, parent_action, start_ns, meter)
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                result.nodes_generated += 1
+                if closed[v]:
+                    continue
+                g2 = g + costs[e]
+                if g2 < best_g[v]:
+                    best_g[v] = g2
+                    parent[v] = u
+                    parent_action[v] = action_ids[e]
+                    heapq.heappush(frontier, (g2 + h_of(v), g2, v))
+        return _finish(graph, result, -1, 0.0, parent, parent_action, start_ns, meter)
+    finally:
+        meter.stop()  # no-op unless the search raised
+
+
+def csr_dijkstra(graph: CompiledGraph, source: int = 0, track_memory: bool = False) -> AStarResult:
+    return csr_astar(graph, None, source, "CSR Dijkstra", track_memory)